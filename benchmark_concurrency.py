@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Measure concurrent request throughput of one worker.
+
+Without --url, simulates a request that does blocking I/O (a database
+query or upstream call) followed by CPU-bound scoring, and compares
+running that work inline on the event loop with running it on the io/cpu
+executors from src.executors. With --url, drives a running server with
+concurrent requests instead and prints its executor stats from /api/health.
+
+    python benchmark_concurrency.py --concurrency 32 --requests 256
+    python benchmark_concurrency.py --url http://localhost:8000/api/search --body '{"query": "ai"}'
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import numpy as np
+
+
+def _blocking_io(milliseconds: float) -> None:
+    time.sleep(milliseconds / 1000)
+
+
+def _cpu_work(matrix: np.ndarray, rounds: int) -> float:
+    total = 0.0
+    for _ in range(rounds):
+        total += float((matrix @ matrix.T).sum())
+    return total
+
+
+def _report(label: str, latencies, elapsed: float) -> dict:
+    latencies = sorted(latencies)
+    report = {
+        "mode": label,
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 1),
+        "latency_ms_p95": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 1),
+    }
+    print(f"{label:<10} {report['requests_per_second']:>8.1f} req/s  "
+          f"p50 {report['latency_ms_p50']:>8.1f} ms  p95 {report['latency_ms_p95']:>8.1f} ms")
+    return report
+
+
+async def _drive(handler, concurrency: int, total: int):
+    """Issue ``total`` requests at once, ``concurrency`` at a time; latency includes time spent waiting to start"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def request(issued_at: float) -> None:
+        async with semaphore:
+            await handler()
+        latencies.append(time.perf_counter() - issued_at)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(started) for _ in range(total)))
+    return latencies, time.perf_counter() - started
+
+
+async def run_simulated(args) -> list:
+    from src.executors import executor_stats, get_executor
+
+    matrix = np.random.default_rng(0).standard_normal((args.matrix_size, args.matrix_size)).astype(np.float32)
+
+    async def inline_request() -> None:
+        _blocking_io(args.io_ms)
+        _cpu_work(matrix, args.cpu_rounds)
+
+    async def pooled_request() -> None:
+        await get_executor("io").run(_blocking_io, args.io_ms)
+        await get_executor("cpu").run(_cpu_work, matrix, args.cpu_rounds)
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent, {args.io_ms:g} ms blocking I/O + "
+          f"{args.cpu_rounds} x {args.matrix_size}^2 matmul each\n")
+    reports = []
+    for label, handler in (("inline", inline_request), ("executors", pooled_request)):
+        latencies, elapsed = await _drive(handler, args.concurrency, args.requests)
+        reports.append(_report(label, latencies, elapsed))
+
+    print(json.dumps(executor_stats(), indent=2))
+    return reports
+
+
+async def run_http(args) -> list:
+    import httpx
+
+    body = json.loads(args.body) if args.body else None
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        status_counts = {}
+
+        async def request() -> None:
+            response = await (client.post(args.url, json=body) if body is not None else client.get(args.url))
+            status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+
+        latencies, elapsed = await _drive(request, args.concurrency, args.requests)
+        reports = [_report("http", latencies, elapsed)]
+        print(f"status codes: {status_counts}")
+
+        health_url = args.url.split("/api/")[0] + "/api/health"
+        try:
+            print(json.dumps((await client.get(health_url)).json().get("executors"), indent=2))
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Could not read executor stats from {health_url}: {e}")
+    return reports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=256)
+    parser.add_argument("--io-ms", type=float, default=20.0, help="simulated blocking I/O per request")
+    parser.add_argument("--cpu-rounds", type=int, default=2, help="simulated scoring matmuls per request")
+    parser.add_argument("--matrix-size", type=int, default=256)
+    parser.add_argument("--url", help="benchmark a running server endpoint instead of the simulation")
+    parser.add_argument("--body", help="JSON body; sends POST requests when set")
+    args = parser.parse_args()
+
+    reports = asyncio.run(run_http(args) if args.url else run_simulated(args))
+    print(json.dumps(reports))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
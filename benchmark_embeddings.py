@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Compare SBERT inference backends (SBERT_BACKEND) for parity, latency and memory.
+
+Each backend runs in its own subprocess so RSS is measured in isolation.
+Scores are compared against the torch backend and the script exits non-zero
+when any backend drifts past the tolerance.
+
+    python benchmark_embeddings.py
+    python benchmark_embeddings.py --backends torch,int8 --tolerance 0.03
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+QUERIES = [
+    "artificial intelligence",
+    "latest news",
+    "stock market earnings",
+    "cricket world cup",
+    "climate change policy",
+]
+
+ARTICLES = [
+    "OpenAI unveils new model as AI race heats up Researchers say the system beats prior benchmarks",
+    "Stocks slide as tech earnings disappoint The Nasdaq fell 2% after several megacaps missed estimates",
+    "India clinch thriller against Australia A late collapse handed India the series in Mumbai",
+    "Parliament passes sweeping climate bill The law sets binding emissions targets through 2040",
+    "New vaccine shows promise in early trials Researchers report strong immune response in adults",
+    "Central bank holds rates steady Policymakers signalled cuts could come later this year",
+    "Streaming giant announces price hike Subscribers will pay more from next month",
+    "Wildfires force evacuations across the region Firefighters battle blazes fanned by strong winds",
+    "Chipmaker expands fab capacity The company will invest billions in new plants",
+    "Football club appoints new manager The former player signs a three-year deal",
+    "Scientists map deep ocean currents Satellite data reveals shifting circulation patterns",
+    "Election results spark protests Opposition parties reject the official count",
+] * 4
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _amplified_scores(query_embeddings: np.ndarray, article_embeddings: np.ndarray) -> np.ndarray:
+    """Cosine similarity with the sigmoid amplification used by NewsDataClient"""
+    query_embeddings = query_embeddings / np.linalg.norm(query_embeddings, axis=1, keepdims=True)
+    article_embeddings = article_embeddings / np.linalg.norm(article_embeddings, axis=1, keepdims=True)
+    similarities = query_embeddings @ article_embeddings.T
+    return 1 / (1 + np.exp(-10 * (similarities - 0.3)))
+
+
+def run_backend(backend: str, output_path: str, batch_size: int, rounds: int) -> None:
+    from src.embedding_backends import load_embedding_backend
+
+    load_started = time.perf_counter()
+    model = load_embedding_backend(MODEL_NAME, backend)
+    load_seconds = time.perf_counter() - load_started
+
+    # Warm-up pass so lazy initialization does not skew latency
+    model.encode(ARTICLES[:batch_size], batch_size=batch_size)
+
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        article_embeddings = model.encode(ARTICLES, batch_size=batch_size)
+        timings.append(time.perf_counter() - started)
+
+    query_embeddings = model.encode(QUERIES, batch_size=batch_size)
+    np.savez(output_path, queries=query_embeddings, articles=article_embeddings)
+
+    print(json.dumps({
+        "backend": model.name,
+        "load_seconds": load_seconds,
+        "encode_ms_p50": float(np.median(timings) * 1000),
+        "encode_ms_per_article": float(np.median(timings) * 1000 / len(ARTICLES)),
+        "rss_mb": _rss_mb(),
+    }))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="torch,int8,onnx")
+    parser.add_argument("--tolerance", type=float, default=0.05,
+                        help="max absolute difference in amplified similarity score vs torch")
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("SBERT_BATCH_SIZE", "32")))
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_backend(args.worker, args.output, args.batch_size, args.rounds)
+        return 0
+
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    if "torch" not in backends:
+        backends.insert(0, "torch")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for backend in backends:
+            output_path = os.path.join(workdir, f"{backend}.npz")
+            completed = subprocess.run(
+                [sys.executable, __file__, "--worker", backend, "--output", output_path,
+                 "--batch-size", str(args.batch_size), "--rounds", str(args.rounds)],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True,
+                text=True,
+            )
+            if completed.returncode != 0:
+                print(f"❌ {backend}: {completed.stderr.strip().splitlines()[-1:]}")
+                continue
+
+            report = json.loads(completed.stdout.strip().splitlines()[-1])
+            if report["backend"] != backend:
+                print(f"⚠️  {backend} unavailable, fell back to {report['backend']}")
+                continue
+
+            embeddings = np.load(output_path)
+            report["scores"] = _amplified_scores(embeddings["queries"], embeddings["articles"])
+            results[backend] = report
+
+    if "torch" not in results:
+        print("❌ torch reference backend failed to run")
+        return 1
+
+    reference = results["torch"]["scores"]
+    failed = False
+    print(f"\n{'backend':<8} {'load s':>8} {'ms/batch':>10} {'ms/article':>11} {'RSS MB':>8} {'max Δscore':>11}")
+    for backend, report in results.items():
+        drift = float(np.max(np.abs(report["scores"] - reference)))
+        ok = drift <= args.tolerance
+        failed = failed or not ok
+        print(f"{backend:<8} {report['load_seconds']:>8.2f} {report['encode_ms_p50']:>10.1f} "
+              f"{report['encode_ms_per_article']:>11.2f} {report['rss_mb']:>8.0f} "
+              f"{drift:>11.4f} {'✅' if ok else '❌'}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Measure API cold-start time for CI tracking.
+
+Reports the median import time of src.main, which heavy modules the import
+pulled in, and (unless --import-only) the time for a fresh uvicorn process to
+answer /api/health and to become ready on /api/ready. The last line of output
+is a JSON summary; the exit code is non-zero when a --max-* budget is exceeded.
+
+    python benchmark_startup.py
+    python benchmark_startup.py --import-only --max-import-seconds 2.5
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that should never load just because the API module was imported
+HEAVY_MODULES = ["torch", "sentence_transformers", "sklearn", "pandas", "openai", "transformers", "onnxruntime"]
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import src.main
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    "seconds": elapsed,
+    "modules": len(sys.modules),
+    "heavy_modules": [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_import(runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"import src.main failed:\n{completed.stderr}")
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    return {
+        "import_seconds_median": statistics.median(sample["seconds"] for sample in samples),
+        "import_seconds_max": max(sample["seconds"] for sample in samples),
+        "modules_loaded": samples[-1]["modules"],
+        "heavy_modules_loaded": samples[-1]["heavy_modules"],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _poll(url: str, deadline: float) -> bool:
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    return False
+
+
+def measure_first_request(timeout: float) -> dict:
+    port = _free_port()
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        base_url = f"http://127.0.0.1:{port}"
+
+        healthy = _poll(f"{base_url}/api/health", deadline)
+        first_request_seconds = time.monotonic() - started if healthy else None
+
+        ready = healthy and _poll(f"{base_url}/api/ready", deadline)
+        ready_seconds = time.monotonic() - started if ready else None
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    return {
+        "first_request_seconds": first_request_seconds,
+        "ready_seconds": ready_seconds,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="import timing samples")
+    parser.add_argument("--import-only", action="store_true", help="skip the uvicorn first-request measurement")
+    parser.add_argument("--timeout", type=float, default=180.0, help="seconds to wait for the server")
+    parser.add_argument("--max-import-seconds", type=float)
+    parser.add_argument("--max-first-request-seconds", type=float)
+    args = parser.parse_args()
+
+    report = measure_import(max(1, args.runs))
+    print(f"📦 import src.main: {report['import_seconds_median']:.3f}s median, "
+          f"{report['modules_loaded']} modules, heavy: {report['heavy_modules_loaded'] or 'none'}")
+
+    if not args.import_only:
+        report.update(measure_first_request(args.timeout))
+        first_request = report["first_request_seconds"]
+        ready = report["ready_seconds"]
+        print(f"🌐 first /api/health: {f'{first_request:.2f}s' if first_request is not None else 'timed out'}")
+        print(f"🧠 /api/ready: {f'{ready:.2f}s' if ready is not None else 'timed out'}")
+
+    failed = False
+    if args.max_import_seconds is not None and report["import_seconds_median"] > args.max_import_seconds:
+        print(f"❌ import time exceeds {args.max_import_seconds}s budget")
+        failed = True
+    if args.max_first_request_seconds is not None:
+        first_request = report.get("first_request_seconds")
+        if first_request is None or first_request > args.max_first_request_seconds:
+            print(f"❌ first request exceeds {args.max_first_request_seconds}s budget")
+            failed = True
+
+    print(json.dumps(report))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
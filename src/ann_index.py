@@ -0,0 +1,306 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .embedding_store import _FileLock
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF) approximate nearest neighbour index over unit vectors.
+
+    Vectors are bucketed by their nearest of ``nlist`` k-means centroids and
+    a search scores only the ``nprobe`` closest buckets. Until there are
+    enough vectors to train centroids, searches scan every row. Inserts are
+    incremental (upsert by id), rows older than ``max_age_seconds`` or past
+    ``max_items`` are dropped, and the whole index round-trips through an
+    ``.npz`` snapshot.
+    """
+
+    def __init__(self, dimension: int, nlist: int = 64, nprobe: int = 8, max_items: int = 20000,
+                 max_age_seconds: float = 7 * 24 * 3600):
+        self.dimension = int(dimension)
+        self.nlist = max(1, int(nlist))
+        self.nprobe = max(1, min(int(nprobe), self.nlist))
+        self.max_items = max(1, int(max_items))
+        self.max_age_seconds = max(60.0, float(max_age_seconds))
+        self._lock = threading.Lock()
+        self._reset()
+        self.searches = 0
+        self.trainings = 0
+
+    def _reset(self) -> None:
+        self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+        self._timestamps = np.zeros(0, dtype=np.float64)
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[str] = []
+        self._metadata: List[Optional[Dict]] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    def _grow(self, extra: int) -> None:
+        used = len(self._ids)
+        if used + extra <= len(self._vectors):
+            return
+        capacity = max(64, used + extra, len(self._vectors) * 2)
+        self._vectors = np.resize(self._vectors, (capacity, self.dimension))
+        self._timestamps = np.resize(self._timestamps, capacity)
+        self._assignments = np.resize(self._assignments, capacity)
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:used] = self._alive[:used]
+        self._alive = alive
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if self._centroids is None:
+            return np.full(len(vectors), -1, dtype=np.int32)
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def add(self, ids: List[str], vectors: np.ndarray, metadata: List[Dict], timestamp: Optional[float] = None) -> None:
+        if not ids:
+            return
+
+        vectors = _normalize_rows(np.asarray(vectors).reshape(len(ids), self.dimension))
+        now = timestamp or time.time()
+        with self._lock:
+            assignments = self._assign(vectors)
+            self._grow(len(ids))
+            for item_id, vector, meta, assignment in zip(ids, vectors, metadata, assignments):
+                row = self._row_by_id.get(item_id)
+                if row is not None:
+                    # Upsert: retire the old row so its bucket entry is ignored
+                    self._alive[row] = False
+                    self._metadata[row] = None
+                row = len(self._ids)
+                self._ids.append(item_id)
+                self._metadata.append(meta)
+                self._vectors[row] = vector
+                self._timestamps[row] = now
+                self._assignments[row] = assignment
+                self._alive[row] = True
+                self._row_by_id[item_id] = row
+                if assignment >= 0:
+                    self._lists[assignment].append(row)
+
+            self._expire(time.time())
+            if self._needs_training():
+                self._train()
+
+    def _expire(self, now: float) -> None:
+        used = len(self._ids)
+        alive = self._alive[:used]
+        expired = alive & (self._timestamps[:used] < now - self.max_age_seconds)
+
+        overflow = int(alive.sum() - expired.sum()) - self.max_items
+        if overflow > 0:
+            remaining = np.flatnonzero(alive & ~expired)
+            oldest = remaining[np.argsort(self._timestamps[remaining], kind="stable")[:overflow]]
+            expired[oldest] = True
+
+        for row in np.flatnonzero(expired):
+            self._alive[row] = False
+            self._metadata[row] = None
+            self._row_by_id.pop(self._ids[row], None)
+
+        # Compact once dead rows dominate, which also rebuilds the buckets
+        if used and len(self._row_by_id) < used // 2:
+            self._compact()
+
+    def _compact(self) -> None:
+        live_rows = np.flatnonzero(self._alive[:len(self._ids)])
+        ids = [self._ids[row] for row in live_rows]
+        metadata = [self._metadata[row] for row in live_rows]
+        vectors = self._vectors[live_rows].copy()
+        timestamps = self._timestamps[live_rows].copy()
+        centroids, trained_size = self._centroids, self._trained_size
+
+        self._reset()
+        self._load_rows(ids, vectors, timestamps, metadata, centroids)
+        self._trained_size = trained_size
+
+    def _load_rows(self, ids: List[str], vectors: np.ndarray, timestamps: np.ndarray, metadata: List[Dict],
+                   centroids: Optional[np.ndarray]) -> None:
+        count = len(ids)
+        self._grow(count)
+        self._ids = list(ids)
+        self._metadata = list(metadata)
+        self._vectors[:count] = vectors
+        self._timestamps[:count] = timestamps
+        self._alive[:count] = True
+        self._row_by_id = {item_id: row for row, item_id in enumerate(ids)}
+        self._set_centroids(centroids)
+
+    def _set_centroids(self, centroids: Optional[np.ndarray]) -> None:
+        used = len(self._ids)
+        self._centroids = centroids
+        self._lists = [[] for _ in range(len(centroids))] if centroids is not None else []
+        if centroids is None:
+            return
+        self._assignments[:used] = self._assign(self._vectors[:used])
+        for row in np.flatnonzero(self._alive[:used]):
+            self._lists[self._assignments[row]].append(int(row))
+
+    def _needs_training(self) -> bool:
+        size = len(self._row_by_id)
+        return size >= self.nlist * 16 and size >= self._trained_size * 2
+
+    def _train(self, iterations: int = 10) -> None:
+        """Spherical k-means over (a sample of) the live vectors"""
+        live_rows = np.flatnonzero(self._alive[:len(self._ids)])
+        rng = np.random.default_rng(0)
+        sample = self._vectors[rng.choice(live_rows, size=min(len(live_rows), 20000), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=self.nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.bincount(labels, minlength=self.nlist) == 0
+            # Re-seed empty buckets so every centroid stays useful
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+            centroids = _normalize_rows(sums)
+
+        self._set_centroids(centroids)
+        self._trained_size = len(live_rows)
+        self.trainings += 1
+
+    def search(self, vector: np.ndarray, k: int = 10,
+               accept: Optional[Callable[[Dict], bool]] = None) -> List[Tuple[float, Dict]]:
+        """Top ``k`` (cosine similarity, metadata) pairs, optionally filtered by ``accept``"""
+        query = _normalize_rows(np.asarray(vector).reshape(1, self.dimension))[0]
+        with self._lock:
+            self.searches += 1
+            used = len(self._ids)
+            if self._centroids is None:
+                rows = np.flatnonzero(self._alive[:used])
+            else:
+                probes = np.argsort(-(self._centroids @ query))[:self.nprobe]
+                rows = np.array([row for probe in probes for row in self._lists[probe]], dtype=np.int64)
+                rows = rows[self._alive[rows]] if len(rows) else rows
+            if not len(rows):
+                return []
+
+            scores = self._vectors[rows] @ query
+            order = np.argsort(-scores)
+            cutoff = time.time() - self.max_age_seconds
+            results = []
+            for index in order:
+                row = rows[index]
+                meta = self._metadata[row]
+                if meta is None or self._timestamps[row] < cutoff or (accept and not accept(meta)):
+                    continue
+                results.append((float(scores[index]), meta))
+                if len(results) >= k:
+                    break
+            return results
+
+    def save(self, path: str) -> None:
+        """
+        Write the live rows to ``path``. Every worker saves to the same file, so
+        the save holds an exclusive lock on it and keeps the rows of the current
+        snapshot that this worker does not hold, newest first up to ``max_items``.
+        """
+        with self._lock:
+            live_rows = np.flatnonzero(self._alive[:len(self._ids)])
+            ids = [self._ids[row] for row in live_rows]
+            vectors = self._vectors[live_rows]
+            timestamps = self._timestamps[live_rows]
+            metadata = [self._metadata[row] for row in live_rows]
+            centroids, trained_size = self._centroids, self._trained_size
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _FileLock(f"{path}.lock"):
+            try:
+                existing = self._read_snapshot(path)
+            except Exception as e:
+                print(f"[ann] Overwriting unreadable ANN snapshot: {e}")
+                existing = None
+
+            if existing is not None:
+                known = set(ids)
+                cutoff = time.time() - self.max_age_seconds
+                extra = [row for row, item_id in enumerate(existing["ids"])
+                         if item_id not in known and existing["timestamps"][row] >= cutoff]
+                if extra:
+                    ids = ids + [existing["ids"][row] for row in extra]
+                    vectors = np.concatenate([vectors, existing["vectors"][extra]])
+                    timestamps = np.concatenate([timestamps, existing["timestamps"][extra]])
+                    metadata = metadata + [existing["metadata"][row] for row in extra]
+                    if len(ids) > self.max_items:
+                        keep = np.sort(np.argsort(-timestamps, kind="stable")[:self.max_items])
+                        ids = [ids[row] for row in keep]
+                        vectors, timestamps = vectors[keep], timestamps[keep]
+                        metadata = [metadata[row] for row in keep]
+                if centroids is None and existing["centroids"] is not None:
+                    centroids, trained_size = existing["centroids"], existing["trained_size"]
+
+            payload = {
+                "vectors": vectors,
+                "timestamps": timestamps,
+                "ids": np.array(ids, dtype=str),
+                "metadata": np.array(json.dumps(metadata, default=float)),
+                "centroids": centroids if centroids is not None else np.zeros((0, self.dimension)),
+                "trained_size": np.array(trained_size),
+            }
+            temp_path = f"{path}.{os.getpid()}.tmp.npz"
+            np.savez(temp_path, **payload)
+            os.replace(temp_path, path)
+
+    def _read_snapshot(self, path: str) -> Optional[Dict]:
+        """Rows and centroids of the snapshot at ``path``, or None when missing or of another dimension"""
+        if not os.path.exists(path):
+            return None
+        with np.load(path, allow_pickle=False) as snapshot:
+            vectors = snapshot["vectors"].astype(np.float32)
+            if vectors.shape[1:] != (self.dimension,):
+                return None
+            centroids = snapshot["centroids"].astype(np.float32)
+            return {
+                "ids": [str(item_id) for item_id in snapshot["ids"]],
+                "vectors": vectors,
+                "timestamps": snapshot["timestamps"].astype(np.float64),
+                "metadata": json.loads(str(snapshot["metadata"])),
+                "centroids": centroids if len(centroids) == self.nlist else None,
+                "trained_size": int(snapshot["trained_size"]),
+            }
+
+    def load(self, path: str) -> bool:
+        snapshot = self._read_snapshot(path)
+        if snapshot is None:
+            return False
+        with self._lock:
+            self._reset()
+            self._load_rows(snapshot["ids"], snapshot["vectors"], snapshot["timestamps"], snapshot["metadata"],
+                            snapshot["centroids"])
+            self._trained_size = snapshot["trained_size"]
+            self._expire(time.time())
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "items": len(self._row_by_id),
+                "max_items": self.max_items,
+                "trained": self._centroids is not None,
+                "nlist": self.nlist,
+                "nprobe": self.nprobe,
+                "max_age_seconds": self.max_age_seconds,
+                "searches": self.searches,
+                "trainings": self.trainings,
+            }
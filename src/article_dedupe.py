@@ -0,0 +1,130 @@
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for ``capacity`` keys at ``error_rate`` false positives"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, int(capacity))
+        error_rate = min(max(float(error_rate), 1e-9), 0.5)
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+        self.count = 0
+
+    def _positions(self, key: str) -> np.ndarray:
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(first + i * second) % self.num_bits for i in range(self.num_hashes)], dtype=np.int64)
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        return bool(np.all(self.bits[positions >> 3] & (1 << (positions & 7)).astype(np.uint8)))
+
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        np.bitwise_or.at(self.bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self.count += 1
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes)
+
+
+class RotatingBloomFilter:
+    """
+    Time-rotated pair of Bloom filters with a fixed memory ceiling.
+
+    Keys go into the current generation and lookups check the current and
+    previous ones, so a key is remembered for between one and two rotation
+    periods. A generation also rotates early once it holds ``capacity``
+    keys, which keeps the false-positive rate near ``error_rate``.
+    """
+
+    def __init__(self, capacity: int = 50000, error_rate: float = 0.001, rotation_seconds: float = 3600.0):
+        self.capacity = max(1, int(capacity))
+        self.error_rate = error_rate
+        self.rotation_seconds = max(1.0, float(rotation_seconds))
+        self._current = BloomFilter(self.capacity, error_rate)
+        self._previous = BloomFilter(self.capacity, error_rate)
+        self._rotated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.rotations = 0
+
+    def _maybe_rotate(self) -> None:
+        now = time.monotonic()
+        if now - self._rotated_at >= self.rotation_seconds or self._current.count >= self.capacity:
+            self._previous = self._current
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = now
+            self.rotations += 1
+
+    def contains_any(self, keys: Iterable[str]) -> bool:
+        with self._lock:
+            self._maybe_rotate()
+            return any(key in self._current or key in self._previous for key in keys)
+
+    def add_all(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            self._maybe_rotate()
+            for key in keys:
+                self._current.add(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._current = BloomFilter(self.capacity, self.error_rate)
+            self._previous = BloomFilter(self.capacity, self.error_rate)
+            self._rotated_at = time.monotonic()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "error_rate": self.error_rate,
+                "rotation_seconds": self.rotation_seconds,
+                "current_keys": self._current.count,
+                "previous_keys": self._previous.count,
+                "bytes": self._current.nbytes + self._previous.nbytes,
+                "rotations": self.rotations,
+            }
+
+
+class DedupeView:
+    """
+    Dedupe state for one request, layered over the shared filter.
+
+    Keys seen in this view are tracked exactly. A view with a ``namespace``
+    also records them in the shared filter under that prefix, and checks
+    it, so a later view with the same namespace (the next page of a search
+    session) still finds them without the session keeping its own sets.
+    Views in different namespaces never suppress each other's results; a
+    view without one dedupes only within its own request.
+    """
+
+    def __init__(self, shared: RotatingBloomFilter, namespace: str = ""):
+        self.shared = shared
+        self.namespace = namespace
+        self._seen: Set[str] = set()
+
+    def _scoped(self, keys: Iterable[str]) -> List[str]:
+        return [f"{self.namespace}|{key}" for key in keys]
+
+    def is_duplicate(self, keys: Iterable[str]) -> bool:
+        keys = [key for key in keys if key]
+        if any(key in self._seen for key in keys):
+            return True
+        return bool(self.namespace) and self.shared.contains_any(self._scoped(keys))
+
+    def add(self, keys: Iterable[str]) -> None:
+        keys = [key for key in keys if key]
+        self._seen.update(keys)
+        if self.namespace:
+            self.shared.add_all(self._scoped(keys))
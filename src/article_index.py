@@ -0,0 +1,173 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class ArticleIndex:
+    """
+    Local SQLite FTS5 index of processed articles, ranked with BM25.
+
+    Every article the client scores is upserted by URL with its metadata and
+    scores, so recent news stays searchable in a few milliseconds and while
+    NewsData is unavailable. Articles older than ``max_age_seconds`` and
+    beyond ``max_articles`` are pruned as new ones arrive.
+    """
+
+    def __init__(self, db_path: str, max_age_seconds: float = 7 * 24 * 3600, max_articles: int = 200000):
+        self.db_path = db_path
+        self.max_age_seconds = max(60.0, float(max_age_seconds))
+        self.max_articles = max(100, int(max_articles))
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.searches = 0
+        self.hits = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, language TEXT, country TEXT, "
+            "category TEXT, published_at TEXT, indexed_at REAL NOT NULL, body TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS articles_indexed_at ON articles (indexed_at)")
+        self._db.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title, description, tokenize='porter')"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def build_match_query(query: str) -> str:
+        """Quote each query term and OR them, so user input never hits FTS5 syntax"""
+        terms = list(dict.fromkeys(_TOKEN_PATTERN.findall((query or "").lower())))
+        return " OR ".join(f'"{term}"' for term in terms[:16])
+
+    def add_many(self, articles: List[Dict], language: str = "", country: str = "") -> None:
+        rows = [article for article in articles if article.get("url") and article.get("title")]
+        if not rows:
+            return
+
+        now = time.time()
+        with self._lock:
+            try:
+                for article in rows:
+                    existing = self._db.execute("SELECT id FROM articles WHERE url = ?", (article["url"],)).fetchone()
+                    values = (
+                        language, country, article.get("category"), article.get("publishedAt"), now,
+                        json.dumps(article, default=float),
+                    )
+                    if existing:
+                        row_id = existing[0]
+                        self._db.execute(
+                            "UPDATE articles SET language = ?, country = ?, category = ?, published_at = ?, "
+                            "indexed_at = ?, body = ? WHERE id = ?",
+                            values + (row_id,),
+                        )
+                        self._db.execute("DELETE FROM articles_fts WHERE rowid = ?", (row_id,))
+                    else:
+                        row_id = self._db.execute(
+                            "INSERT INTO articles (url, language, country, category, published_at, indexed_at, body) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (article["url"],) + values,
+                        ).lastrowid
+                    self._db.execute(
+                        "INSERT INTO articles_fts (rowid, title, description) VALUES (?, ?, ?)",
+                        (row_id, article.get("title", ""), article.get("description") or ""),
+                    )
+
+                self._writes += len(rows)
+                if self._writes >= 500:
+                    self._writes = 0
+                    self._prune(now)
+                self._db.commit()
+            except sqlite3.Error as e:
+                self._db.rollback()
+                print(f"[index] Failed to index articles: {e}")
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.max_age_seconds
+        overflow = self._db.execute(
+            "SELECT indexed_at FROM articles ORDER BY indexed_at DESC LIMIT 1 OFFSET ?", (self.max_articles,)
+        ).fetchone()
+        if overflow:
+            cutoff = max(cutoff, overflow[0])
+        self._db.execute(
+            "DELETE FROM articles_fts WHERE rowid IN (SELECT id FROM articles WHERE indexed_at <= ?)", (cutoff,)
+        )
+        self._db.execute("DELETE FROM articles WHERE indexed_at <= ?", (cutoff,))
+
+    def search(self, query: str, language: str = "", country: str = "", limit: int = 50) -> List[Dict]:
+        """Articles matching ``query`` from the last ``max_age_seconds``, best BM25 match first"""
+        match_query = self.build_match_query(query)
+        if not match_query:
+            return []
+
+        sql = (
+            "SELECT a.body, bm25(articles_fts, 4.0, 1.0) AS rank FROM articles_fts "
+            "JOIN articles a ON a.id = articles_fts.rowid "
+            "WHERE articles_fts MATCH ? AND a.indexed_at >= ?"
+        )
+        params: List = [match_query, time.time() - self.max_age_seconds]
+        if language:
+            sql += " AND a.language = ?"
+            params.append(language)
+        if country:
+            sql += " AND a.country = ?"
+            params.append(country)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(max(1, int(limit)))
+
+        with self._lock:
+            try:
+                rows = self._db.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                print(f"[index] Local search failed: {e}")
+                return []
+            self.searches += 1
+            if rows:
+                self.hits += 1
+
+        results = []
+        for body, rank in rows:
+            article = json.loads(body)
+            # bm25() is lower-is-better; expose it as a positive relevance value
+            article["bm25_score"] = round(-rank, 4)
+            results.append(article)
+        return results
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            return {
+                "articles": count,
+                "max_articles": self.max_articles,
+                "max_age_seconds": self.max_age_seconds,
+                "searches": self.searches,
+                "searches_with_hits": self.hits,
+            }
+
+
+def open_article_index() -> Optional[ArticleIndex]:
+    """Open the index configured by ARTICLE_INDEX_DB, or None when disabled"""
+    db_path = os.getenv("ARTICLE_INDEX_DB", os.path.join(".cache", "articles.sqlite3")).strip()
+    if not db_path:
+        return None
+
+    try:
+        return ArticleIndex(
+            db_path,
+            max_age_seconds=float(os.getenv("ARTICLE_INDEX_MAX_AGE_SECONDS", str(7 * 24 * 3600))),
+            max_articles=int(os.getenv("ARTICLE_INDEX_MAX_ARTICLES", "200000")),
+        )
+    except sqlite3.Error as e:
+        print(f"[index] Article index disabled: {e}")
+        return None
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Dict
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one upstream dependency.
+
+    ``failure_threshold`` consecutive failures open the circuit; while open,
+    ``allow`` refuses calls so callers can fall back immediately. After
+    ``recovery_seconds`` the circuit turns half-open and lets up to
+    ``half_open_max_calls`` probe calls through: a successful probe closes
+    it again, a failed one re-opens it for another recovery period.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_seconds: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.recovery_seconds = max(0.0, float(recovery_seconds))
+        self.half_open_max_calls = max(1, int(half_open_max_calls))
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.rejected = 0
+
+    def _advance(self, now: float) -> None:
+        if self._state == self.OPEN and now - self._opened_at >= self.recovery_seconds:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+
+    def _open(self, now: float) -> None:
+        if self._state != self.OPEN:
+            self.times_opened += 1
+            print(f"[circuit] {self.name} opened after {self._failures} failures")
+        self._state = self.OPEN
+        self._opened_at = now
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_seconds - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; half-open hands out probe slots"""
+        with self._lock:
+            self._advance(time.monotonic())
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Give back a probe slot for a call that never reached upstream"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                print(f"[circuit] {self.name} closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open(now)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_seconds": self.recovery_seconds,
+                "retry_after_seconds": (
+                    max(0.0, self.recovery_seconds - (now - self._opened_at)) if self._state == self.OPEN else 0.0
+                ),
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
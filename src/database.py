@@ -20,9 +20,15 @@ DATABASE_URL = (
     f"mysql+pymysql://{MYSQL_USER}:{_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}?charset=utf8mb4"
 )
 
+# Endpoints hold a connection per io executor thread, so size + overflow should cover IO_EXECUTOR_WORKERS
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "8"))
+
 engine = create_engine(
     DATABASE_URL,
     pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
     future=True,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
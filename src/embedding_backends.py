@@ -0,0 +1,237 @@
+import importlib.util
+import os
+import queue
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+# torch, sentence-transformers and optimum are imported inside the backends so
+# processes that only talk to the shared embedding server never load them.
+
+
+EMBEDDING_BACKENDS = ("torch", "int8", "onnx")
+
+
+class TorchEmbeddingBackend:
+    """Reference fp32 SentenceTransformer inference"""
+
+    name = "torch"
+
+    def __init__(self, model_name: str):
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        threads = _torch_thread_count()
+        if threads:
+            torch.set_num_threads(threads)
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        return np.asarray(self.model.encode(texts, batch_size=batch_size), dtype=np.float32)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+
+class Int8EmbeddingBackend(TorchEmbeddingBackend):
+    """SentenceTransformer with dynamically quantized int8 Linear layers"""
+
+    name = "int8"
+
+    def __init__(self, model_name: str):
+        import torch
+
+        super().__init__(model_name)
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxEmbeddingBackend:
+    """ONNX Runtime export of the model with mean pooling and L2 normalization"""
+
+    name = "onnx"
+
+    def __init__(self, model_name: str, max_seq_length: int = 256):
+        import onnxruntime  # pyright: ignore[reportMissingImports]
+        from optimum.onnxruntime import ORTModelForFeatureExtraction  # pyright: ignore[reportMissingImports]
+        from transformers import AutoTokenizer
+
+        session_options = onnxruntime.SessionOptions()
+        threads = _torch_thread_count()
+        if threads:
+            session_options.intra_op_num_threads = threads
+
+        self.model_name = model_name
+        self.max_seq_length = max_seq_length
+        model_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+        self.tokenizer = AutoTokenizer.from_pretrained(model_id)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            model_id, export=True, session_options=session_options
+        )
+        self._dimension = int(self.model.config.hidden_size)
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            outputs = self.model(**inputs)
+            token_embeddings = np.asarray(outputs.last_hidden_state, dtype=np.float32)
+
+            # Mean pooling over non-padding tokens, matching the SBERT pipeline
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+            batches.append(pooled / np.clip(norms, 1e-12, None))
+
+        return np.vstack(batches)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+
+def _torch_thread_count() -> int:
+    """Intra-op threads per process: TORCH_NUM_THREADS, else cores split across WEB_CONCURRENCY workers"""
+    configured = os.getenv("TORCH_NUM_THREADS", "").strip()
+    if configured:
+        return max(1, int(configured))
+
+    workers = os.getenv("WEB_CONCURRENCY", "").strip()
+    if workers:
+        return max(1, (os.cpu_count() or 1) // max(1, int(workers)))
+    return 0
+
+
+class _PendingEncode:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.vectors: Optional[np.ndarray] = None
+        self.error: Optional[str] = None
+
+
+class EmbeddingBatcher:
+    """
+    Collects encode requests from concurrent callers for a short window and
+    runs them through the model as one batch.
+    """
+
+    def __init__(self, model, window_ms: float = 5.0, max_batch: int = 128, batch_size: int = 32):
+        self.model = model
+        self.window_seconds = max(0.0, window_ms) / 1000
+        self.max_batch = max(1, max_batch)
+        self.batch_size = max(1, batch_size)
+        self._queue: "queue.Queue[_PendingEncode]" = queue.Queue()
+        self.batches = 0
+        self.texts = 0
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        pending = _PendingEncode(texts)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error:
+            raise RuntimeError(pending.error)
+        return pending.vectors
+
+    def _collect(self) -> List[_PendingEncode]:
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.monotonic() + self.window_seconds
+
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(pending)
+            size += len(pending.texts)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            texts = [text for pending in batch for text in pending.texts]
+            try:
+                vectors = np.asarray(self.model.encode(texts, batch_size=self.batch_size), dtype=np.float32)
+                offset = 0
+                for pending in batch:
+                    pending.vectors = vectors[offset:offset + len(pending.texts)]
+                    offset += len(pending.texts)
+            except Exception as e:
+                for pending in batch:
+                    pending.error = str(e)
+            self.batches += 1
+            self.texts += len(texts)
+            for pending in batch:
+                pending.done.set()
+
+
+class MicroBatchingBackend:
+    """Wraps a backend so concurrent encode calls in one process share forward passes"""
+
+    def __init__(self, backend, window_ms: float, max_batch: int = 128, batch_size: int = 32):
+        self.backend = backend
+        self.name = backend.name
+        self.model_name = getattr(backend, "model_name", "")
+        self.batcher = EmbeddingBatcher(backend, window_ms, max_batch, batch_size)
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        return self.batcher.encode(list(texts))
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.backend.get_sentence_embedding_dimension()
+
+
+def with_micro_batching(backend, batch_size: int = 32):
+    """Enable in-process micro-batching when SBERT_MICROBATCH_WINDOW_MS is positive"""
+    window_ms = float(os.getenv("SBERT_MICROBATCH_WINDOW_MS", "0"))
+    if window_ms <= 0:
+        return backend
+
+    max_batch = int(os.getenv("SBERT_MICROBATCH_MAX_BATCH", "64"))
+    print(f"[embeddings] Micro-batching encode calls ({window_ms}ms window, max {max_batch} texts)")
+    return MicroBatchingBackend(backend, window_ms, max_batch, batch_size)
+
+
+def _is_installed(module_name: str) -> bool:
+    return importlib.util.find_spec(module_name) is not None
+
+
+def load_embedding_backend(model_name: str, backend: str = ""):
+    """Load the inference backend selected by SBERT_BACKEND, falling back to torch"""
+    backend = (backend or os.getenv("SBERT_BACKEND", "torch")).strip().lower()
+
+    if backend == "onnx":
+        if not _is_installed("optimum") or not _is_installed("onnxruntime"):
+            print("[embeddings] optimum[onnxruntime] is not installed, using torch backend")
+        else:
+            return OnnxEmbeddingBackend(model_name)
+
+    if backend == "int8":
+        if not _is_installed("torch"):
+            print("[embeddings] torch quantization is unavailable, using torch backend")
+        else:
+            return Int8EmbeddingBackend(model_name)
+
+    if backend not in EMBEDDING_BACKENDS:
+        print(f"[embeddings] Unknown SBERT_BACKEND '{backend}', using torch backend")
+
+    return TorchEmbeddingBackend(model_name)
@@ -0,0 +1,210 @@
+"""
+Shared SBERT inference service for all API workers on a box.
+
+Run one server per box and point the API workers at it with
+EMBEDDING_SERVER_SOCKET; the workers then skip loading their own model copy.
+
+    python -m src.embedding_server --socket /tmp/newsrec-embeddings.sock
+
+Wire format, on a Unix stream socket: each message is a 4-byte big-endian
+length followed by a JSON header. Encode responses carry ``rows * dim``
+little-endian float32 values right after the header.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .embedding_backends import EmbeddingBatcher, load_embedding_backend
+
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+def send_message(sock: socket.socket, header: Dict, payload: bytes = b"") -> None:
+    encoded = json.dumps(header).encode("utf-8")
+    sock.sendall(struct.pack(">I", len(encoded)) + encoded + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(remaining)
+        if not chunk:
+            raise ConnectionError("embedding server connection closed")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Dict:
+    (length,) = struct.unpack(">I", _recv_exact(sock, 4))
+    return json.loads(_recv_exact(sock, length).decode("utf-8"))
+
+
+def recv_vectors(sock: socket.socket, rows: int, dim: int) -> np.ndarray:
+    payload = _recv_exact(sock, rows * dim * 4)
+    return np.frombuffer(payload, dtype="<f4").reshape(rows, dim).copy()
+
+
+class _EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        server = self.server
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ConnectionError, struct.error, ValueError):
+                return
+
+            op = request.get("op", "encode")
+            if op == "info":
+                send_message(self.request, {
+                    "model": server.model_name,
+                    "backend": server.model.name,
+                    "dim": server.dimension,
+                    "batches": server.batcher.batches,
+                    "texts": server.batcher.texts,
+                })
+                continue
+
+            texts = [str(text) for text in request.get("texts", [])]
+            try:
+                vectors = server.batcher.encode(texts) if texts else np.zeros((0, server.dimension), dtype=np.float32)
+            except Exception as e:
+                send_message(self.request, {"error": str(e)})
+                continue
+
+            vectors = np.ascontiguousarray(vectors, dtype="<f4")
+            send_message(self.request, {"rows": int(vectors.shape[0]), "dim": server.dimension}, vectors.tobytes())
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class EmbeddingServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, socket_path: str, model_name: str, window_ms: float, max_batch: int, batch_size: int):
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.model_name = model_name
+            self.model = load_embedding_backend(model_name)
+            self.dimension = self.model.get_sentence_embedding_dimension()
+            self.batcher = EmbeddingBatcher(self.model, window_ms, max_batch, batch_size)
+            super().__init__(socket_path, _EmbeddingRequestHandler)
+else:
+    EmbeddingServer = None
+
+
+class RemoteEmbeddingBackend:
+    """Embedding backend that forwards encode calls to the shared server"""
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        info = self._request({"op": "info"})
+        self.name = info["backend"]
+        self.model_name = info["model"]
+        self._dimension = int(info["dim"])
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            finally:
+                self._local.sock = None
+
+    def _request(self, header: Dict) -> Dict:
+        _, response = self._exchange(header)
+        if response.get("error"):
+            raise RuntimeError(f"embedding server error: {response['error']}")
+        return response
+
+    def _exchange(self, header: Dict) -> Tuple[socket.socket, Dict]:
+        # One reconnect covers a server restart between requests
+        for attempt in range(2):
+            try:
+                sock = self._connection()
+                send_message(sock, header)
+                return sock, recv_message(sock)
+            except (OSError, ConnectionError):
+                self._close()
+                if attempt:
+                    raise
+        raise ConnectionError("embedding server unreachable")
+
+    def encode(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self._dimension), dtype=np.float32)
+
+        sock, response = self._exchange({"op": "encode", "texts": list(texts)})
+        if response.get("error"):
+            raise RuntimeError(f"embedding server error: {response['error']}")
+        try:
+            return recv_vectors(sock, response["rows"], response["dim"])
+        except (OSError, ConnectionError):
+            self._close()
+            raise
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+
+def connect_embedding_server(socket_path: str = "") -> Optional[RemoteEmbeddingBackend]:
+    """Connect to the server at EMBEDDING_SERVER_SOCKET, or None to load a local model"""
+    socket_path = (socket_path or os.getenv("EMBEDDING_SERVER_SOCKET", "")).strip()
+    if not socket_path or not hasattr(socket, "AF_UNIX"):
+        return None
+
+    try:
+        backend = RemoteEmbeddingBackend(socket_path)
+    except Exception as e:
+        print(f"[embeddings] Embedding server at {socket_path} unavailable ({e}), loading local model")
+        return None
+
+    print(f"[embeddings] Using shared embedding server at {socket_path} ({backend.name})")
+    return backend
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shared SBERT embedding server")
+    parser.add_argument("--socket", default=os.getenv("EMBEDDING_SERVER_SOCKET", "/tmp/newsrec-embeddings.sock"))
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--window-ms", type=float, default=float(os.getenv("EMBEDDING_SERVER_WINDOW_MS", "5")))
+    parser.add_argument("--max-batch", type=int, default=int(os.getenv("EMBEDDING_SERVER_MAX_BATCH", "128")))
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("SBERT_BATCH_SIZE", "32")))
+    args = parser.parse_args()
+
+    if EmbeddingServer is None:
+        raise SystemExit("Unix domain sockets are not available on this platform")
+
+    server = EmbeddingServer(args.socket, args.model, args.window_ms, args.max_batch, args.batch_size)
+    os.chmod(args.socket, 0o660)
+    print(f"[embeddings] Serving {args.model} ({server.model.name}) on {args.socket}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes run a single worker
+    fcntl = None
+
+
+class EmbeddingStore:
+    """
+    On-disk article embedding store shared by every worker on a box.
+
+    Vectors live in a memory-mapped float32 matrix and the content hash for
+    each row lives in a fixed-width index file. Rows are written as a ring
+    buffer, so the store never grows past ``capacity`` rows; a lookup only
+    trusts a row while the index still holds the requested key, before and
+    after the vector is copied. Writers clear a recycled row's key before
+    overwriting its vector, so a copy that overlaps a write never passes.
+    """
+
+    KEY_BYTES = 32
+    HEADER_BYTES = 8
+
+    def __init__(self, directory: str, dimension: int, capacity: int = 100000):
+        self.directory = directory
+        self.dimension = int(dimension)
+        self.capacity = max(1, int(capacity))
+
+        os.makedirs(directory, exist_ok=True)
+        suffix = f"{self.dimension}x{self.capacity}"
+        self.vectors_path = os.path.join(directory, f"vectors-{suffix}.f32")
+        self.index_path = os.path.join(directory, f"index-{suffix}.idx")
+        self.lock_path = os.path.join(directory, f"store-{suffix}.lock")
+
+        with self._locked():
+            self._ensure_file(self.vectors_path, self.capacity * self.dimension * 4)
+            self._ensure_file(self.index_path, self.HEADER_BYTES + self.capacity * self.KEY_BYTES)
+
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+",
+                                  shape=(self.capacity, self.dimension))
+        self._counter = np.memmap(self.index_path, dtype="<u8", mode="r+", shape=(1,))
+        self._keys = np.memmap(self.index_path, dtype=f"S{self.KEY_BYTES}", mode="r+",
+                               offset=self.HEADER_BYTES, shape=(self.capacity,))
+
+        # Guards _slots/_synced and row writes between threads; the file lock covers other workers
+        self._lock = threading.Lock()
+        self._slots: Dict[str, int] = {}
+        self._synced = 0
+
+    def _ensure_file(self, path: str, size: int) -> None:
+        if os.path.exists(path) and os.path.getsize(path) == size:
+            return
+        with open(path, "wb") as handle:
+            handle.truncate(size)
+
+    def _locked(self):
+        return _FileLock(self.lock_path)
+
+    def _refresh(self) -> None:
+        """Pick up rows appended by other workers since the last sync; call with ``_lock`` held"""
+        written = int(self._counter[0])
+        if written == self._synced:
+            return
+
+        start = max(self._synced, written - self.capacity)
+        for position in range(start, written):
+            slot = position % self.capacity
+            key = self._row_key(slot)
+            if key:
+                self._slots[key] = slot
+        self._synced = written
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return stored vectors for whichever keys are present"""
+        found = {}
+        with self._lock:
+            self._refresh()
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is None:
+                    continue
+                if self._row_key(slot) != key:
+                    # Row was recycled by the ring buffer
+                    self._slots.pop(key, None)
+                    continue
+                vector = np.array(self._vectors[slot])
+                if self._row_key(slot) != key:
+                    # Another worker recycled the row while it was being copied
+                    self._slots.pop(key, None)
+                    continue
+                found[key] = vector
+        return found
+
+    def _row_key(self, slot: int) -> str:
+        return self._keys[slot].decode("ascii", errors="ignore")
+
+    def put_many(self, keys: List[str], vectors: np.ndarray) -> None:
+        """Append vectors for keys that are not stored yet"""
+        if not keys:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), self.dimension)
+        with self._locked(), self._lock:
+            self._refresh()
+            written = int(self._counter[0])
+            for key, vector in zip(keys, vectors):
+                if key in self._slots:
+                    continue
+                slot = written % self.capacity
+                self._keys[slot] = b""
+                self._vectors[slot] = vector
+                self._keys[slot] = key.encode("ascii")[:self.KEY_BYTES]
+                self._slots[key] = slot
+                written += 1
+
+            # Publish rows before the counter so readers never see a half-written row
+            self._vectors.flush()
+            self._keys.flush()
+            self._counter[0] = written
+            self._counter.flush()
+            self._synced = written
+
+    def __len__(self) -> int:
+        return min(int(self._counter[0]), self.capacity)
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file, a no-op where fcntl is unavailable"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        self._handle = open(self.path, "a+")
+        fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._handle is not None:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+            self._handle.close()
+            self._handle = None
+        return False
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU cache of normalized query text to embedding.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entries
+    are evicted once the cached vectors exceed ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, ttl_seconds: float = 3600):
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join((query or "").lower().split())
+
+    @staticmethod
+    def _entry_size(key: str, vector: np.ndarray) -> int:
+        return vector.nbytes + len(key)
+
+    def _remove(self, key: str) -> None:
+        vector, _ = self._entries.pop(key)
+        self._bytes -= self._entry_size(key, vector)
+
+    def get(self, query: str) -> Optional[np.ndarray]:
+        key = self.normalize(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            vector, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, query: str, vector: np.ndarray) -> None:
+        key = self.normalize(query)
+        vector = np.asarray(vector, dtype=np.float32)
+        size = self._entry_size(key, vector)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (vector, time.monotonic())
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+def open_embedding_store(model_name: str, dimension: int) -> Optional[EmbeddingStore]:
+    """Open the store configured by EMBEDDING_STORE_DIR, or None when disabled"""
+    directory = os.getenv("EMBEDDING_STORE_DIR", os.path.join(".cache", "embedding_store")).strip()
+    if not directory:
+        return None
+
+    capacity = int(os.getenv("EMBEDDING_STORE_CAPACITY", "100000"))
+    try:
+        return EmbeddingStore(os.path.join(directory, model_name), dimension, capacity)
+    except Exception as e:
+        print(f"[embeddings] Embedding store disabled: {e}")
+        return None
@@ -0,0 +1,175 @@
+"""
+Bounded thread pools for blocking work called from async endpoints.
+
+- ``io``: SQLAlchemy sessions, OpenAI calls and other work that mostly waits
+- ``cpu``: SBERT scoring and other work that holds a core
+
+Each pool caps its queue: once ``max_queue`` calls are waiting, new ones
+fail fast with ``ExecutorOverloaded`` instead of piling up behind slow
+ones. Queue depth, wait time and run time are reported by ``stats()``.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import os
+import threading
+import time
+from typing import Callable, Dict
+
+
+class ExecutorOverloaded(RuntimeError):
+    """The pool's queue is full; the caller should shed the request"""
+
+    def __init__(self, name: str, queued: int, retry_after: float = 1.0):
+        super().__init__(f"{name} executor overloaded ({queued} calls queued)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class BoundedExecutor:
+    """Thread pool with a queue limit and wait/run time metrics"""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(1, int(max_queue))
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._waits = collections.deque(maxlen=1024)
+        self._runs = collections.deque(maxlen=1024)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.max_wait_seconds = 0.0
+        self.peak_queued = 0
+
+    def _call(self, submitted_at: float, fn: Callable, args, kwargs):
+        started = time.perf_counter()
+        wait = started - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._waits.append(wait)
+            self.max_wait_seconds = max(self.max_wait_seconds, wait)
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self.completed += 1
+                self._runs.append(time.perf_counter() - started)
+
+    def _dequeue_if_cancelled(self, future: concurrent.futures.Future) -> None:
+        # A call cancelled before it started never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def submit(self, fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self.rejected += 1
+                raise ExecutorOverloaded(self.name, self._queued)
+            self._queued += 1
+            self.submitted += 1
+            self.peak_queued = max(self.peak_queued, self._queued)
+
+        future = self._pool.submit(self._call, time.perf_counter(), fn, args, kwargs)
+        future.add_done_callback(self._dequeue_if_cancelled)
+        return future
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run ``fn`` on the pool and await its result without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            waits, runs = list(self._waits), list(self._runs)
+            return {
+                "workers": self.max_workers,
+                "active": self._active,
+                "queued": self._queued,
+                "max_queue": self.max_queue,
+                "peak_queued": self.peak_queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_ms_p50": round(_percentile(waits, 0.5) * 1000, 2),
+                "wait_ms_p95": round(_percentile(waits, 0.95) * 1000, 2),
+                "wait_ms_max": round(self.max_wait_seconds * 1000, 2),
+                "run_ms_p50": round(_percentile(runs, 0.5) * 1000, 2),
+                "run_ms_p95": round(_percentile(runs, 0.95) * 1000, 2),
+            }
+
+
+_EXECUTORS: Dict[str, BoundedExecutor] = {}
+_EXECUTORS_LOCK = threading.Lock()
+
+
+def _default_sizes(kind: str):
+    if kind == "cpu":
+        # Scoring is numpy/torch work that already uses several cores per call
+        return max(1, min(4, os.cpu_count() or 1)), 64
+    return 16, 256
+
+
+def get_executor(kind: str) -> BoundedExecutor:
+    """The worker-wide ``io`` or ``cpu`` pool, sized by ``<KIND>_EXECUTOR_WORKERS`` / ``<KIND>_EXECUTOR_QUEUE``"""
+    executor = _EXECUTORS.get(kind)
+    if executor is not None:
+        return executor
+
+    with _EXECUTORS_LOCK:
+        if kind not in _EXECUTORS:
+            workers, queue = _default_sizes(kind)
+            _EXECUTORS[kind] = BoundedExecutor(
+                kind,
+                max_workers=int(os.getenv(f"{kind.upper()}_EXECUTOR_WORKERS", str(workers))),
+                max_queue=int(os.getenv(f"{kind.upper()}_EXECUTOR_QUEUE", str(queue))),
+            )
+        return _EXECUTORS[kind]
+
+
+def offload(kind: str):
+    """Turn a blocking function into a coroutine that runs on the ``kind`` pool.
+
+    The wrapper keeps the function's signature, so it can decorate FastAPI
+    endpoints that use sync dependencies like SQLAlchemy sessions.
+    """
+    def decorate(fn: Callable):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await get_executor(kind).run(fn, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def executor_stats() -> Dict:
+    return {kind: executor.stats() for kind, executor in sorted(_EXECUTORS.items())}
+
+
+def shutdown_executors() -> None:
+    with _EXECUTORS_LOCK:
+        for executor in _EXECUTORS.values():
+            executor.shutdown()
+        _EXECUTORS.clear()
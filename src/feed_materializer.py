@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .upstream_scheduler import PRIORITY_RESERVES
+
+
+class FeedMaterializer:
+    """
+    Keeps page 1 of the personalized feed precomputed for recently active users.
+
+    ``/api/feed`` calls ``touch`` with each signed-in request. Users seen
+    within ``active_window_seconds`` are rebuilt every ``interval_seconds``
+    by ``build_feed``, an async callable that takes the page-1 request and
+    returns ``(cache_key, feed, retry_after)``. At most ``max_builds_per_cycle``
+    feeds are built per tick, and only while the scheduler has tokens above
+    its background reserve, so precomputing never eats into the budget that
+    live requests rely on. ``invalidate`` drops a user's feed after profile
+    writes and queues it for an immediate rebuild.
+    """
+
+    # Personalized and general legs
+    UPSTREAM_CALLS_PER_FEED = 2
+
+    def __init__(self, build_feed: Callable[[Any], Awaitable[tuple]], scheduler, interval_seconds: float = 600.0,
+                 active_window_seconds: float = 3600.0, max_users: int = 500, max_builds_per_cycle: int = 5,
+                 tick_seconds: float = 30.0, max_age_seconds: Optional[float] = None):
+        self.build_feed = build_feed
+        self.scheduler = scheduler
+        self.interval_seconds = max(30.0, float(interval_seconds))
+        self.active_window_seconds = max(self.interval_seconds, float(active_window_seconds))
+        self.max_users = max(1, int(max_users))
+        self.max_builds_per_cycle = max(1, int(max_builds_per_cycle))
+        self.tick_seconds = max(1.0, float(tick_seconds))
+        self.max_age_seconds = float(max_age_seconds or self.interval_seconds * 2)
+        self._users: "OrderedDict[str, Dict]" = OrderedDict()
+        # invalidate() runs on endpoint threads while touch/get and builds run on the event loop
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.builds = 0
+        self.failures = 0
+        self.hits = 0
+        self.misses = 0
+        self.skipped_for_budget = 0
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def touch(self, email: str, request) -> None:
+        """Record a feed request; a new user or changed request is rebuilt on the next tick"""
+        now = time.time()
+        with self._lock:
+            user = self._users.get(email)
+            if user is None or user["request"] != request:
+                user = {"request": request, "cache_key": None, "feed": None, "built_at": None, "due": 0.0,
+                        "failures": 0, "generation": 0}
+                self._users[email] = user
+            user["last_seen"] = now
+            self._users.move_to_end(email)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            user = self._users.get(email)
+            if user is not None:
+                user.update(cache_key=None, feed=None, built_at=None, due=0.0, generation=user["generation"] + 1)
+
+    def get(self, email: str, cache_key: str) -> Optional[Dict]:
+        """The precomputed feed and its build time, if it matches ``cache_key`` and is recent enough"""
+        with self._lock:
+            user = self._users.get(email)
+            if (
+                user is None
+                or user["feed"] is None
+                or user["cache_key"] != cache_key
+                or time.time() - user["built_at"] > self.max_age_seconds
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {"feed": user["feed"], "built_at": user["built_at"]}
+
+    def _has_budget(self) -> bool:
+        stats = self.scheduler.stats()
+        reserve = stats["burst"] * PRIORITY_RESERVES["background"]
+        return stats["tokens"] - reserve >= self.UPSTREAM_CALLS_PER_FEED
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_cycle()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[feed] Materializer error: {e}")
+            await asyncio.sleep(self.tick_seconds)
+
+    async def run_cycle(self) -> int:
+        """Rebuild due feeds, most recently active users first; returns how many were built"""
+        now = time.time()
+        with self._lock:
+            for email in [email for email, user in self._users.items()
+                          if now - user["last_seen"] > self.active_window_seconds]:
+                del self._users[email]
+            due = [(email, user, user["request"], user["generation"])
+                   for email, user in reversed(self._users.items()) if user["due"] <= now]
+
+        built = 0
+        for email, user, request, generation in due[:self.max_builds_per_cycle]:
+            if not self._has_budget():
+                self.skipped_for_budget += 1
+                break
+
+            try:
+                cache_key, feed, retry_after = await self.build_feed(request)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # One user's failure must not keep the rest of the cycle from being built
+                print(f"[feed] Materializing feed for {email} failed: {e}")
+                cache_key, feed, retry_after = None, None, None
+
+            if feed and feed.get("all_articles"):
+                with self._lock:
+                    if self._users.get(email) is not user or user["generation"] != generation:
+                        # Invalidated or replaced while building
+                        continue
+                    user.update(cache_key=cache_key, feed=feed, built_at=time.time(), failures=0,
+                                due=time.time() + self.interval_seconds)
+                self.builds += 1
+                built += 1
+            else:
+                with self._lock:
+                    user["failures"] += 1
+                    backoff = min(self.active_window_seconds, self.interval_seconds * (2 ** (user["failures"] - 1)))
+                    user["due"] = time.time() + max(backoff, retry_after or 0.0)
+                self.failures += 1
+                if retry_after:
+                    # Upstream is throttling; leave the rest for a later tick
+                    break
+        return built
+
+    def stats(self) -> Dict:
+        now = time.time()
+        with self._lock:
+            active_users = len(self._users)
+            materialized = sum(1 for user in self._users.values()
+                               if user["feed"] is not None and now - user["built_at"] <= self.max_age_seconds)
+        return {
+            "active_users": active_users,
+            "materialized": materialized,
+            "interval_seconds": self.interval_seconds,
+            "active_window_seconds": self.active_window_seconds,
+            "builds": self.builds,
+            "failures": self.failures,
+            "hits": self.hits,
+            "misses": self.misses,
+            "skipped_for_budget": self.skipped_for_budget,
+        }
@@ -0,0 +1,228 @@
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes run a single worker
+    fcntl = None
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class HeadlinePoller:
+    """
+    Background refresh of top headlines into an in-memory snapshot.
+
+    One worker per box wins a non-blocking lock on ``lock_path`` and polls
+    NewsData for every country x language slot, at ``interval_seconds``
+    with random jitter and exponential backoff on failure, using the
+    scheduler's "background" priority. It writes the processed results to
+    ``snapshot_path``; the other workers reload that file when it changes
+    and keep retrying the lock in case the leader exits.
+    """
+
+    def __init__(self, client, countries: List[str], languages: List[str], interval_seconds: float = 300.0,
+                 jitter: float = 0.1, max_backoff_seconds: float = 1800.0, max_age_seconds: Optional[float] = None,
+                 lock_path: str = "", snapshot_path: str = ""):
+        self.client = client
+        self.interval_seconds = max(10.0, float(interval_seconds))
+        self.jitter = min(max(float(jitter), 0.0), 0.5)
+        self.max_backoff_seconds = max(self.interval_seconds, float(max_backoff_seconds))
+        self.max_age_seconds = float(max_age_seconds or self.interval_seconds * 3)
+        self.lock_path = lock_path
+        self.snapshot_path = snapshot_path
+        self.slots: Dict[str, Dict] = {}
+        for country in countries or [""]:
+            for language in languages or ["en"]:
+                normalized_country = client._normalize_country(country)
+                key = self.slot_key(normalized_country, language)
+                self.slots[key] = {"country": normalized_country, "language": language, "next_due": 0.0, "failures": 0}
+
+        self.is_leader = False
+        self._lock_handle = None
+        self._snapshot: Dict[str, Dict] = {}
+        self._snapshot_mtime = 0.0
+        self._snapshot_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def slot_key(country: str, language: str) -> str:
+        return f"{country or 'any'}:{(language or 'en').lower()}"
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="headline-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._lock_handle is not None:
+            self._lock_handle.close()
+            self._lock_handle = None
+            self.is_leader = False
+
+    def _try_become_leader(self) -> bool:
+        if fcntl is None or not self.lock_path:
+            return True
+
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle = open(self.lock_path, "a+")
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return False
+
+        # Held for the life of the process; the OS releases it if this worker dies
+        self._lock_handle = handle
+        print(f"[headlines] Worker {os.getpid()} is polling headlines for {len(self.slots)} slots")
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if not self.is_leader:
+                    self.is_leader = self._try_become_leader()
+                    if self.is_leader:
+                        # Serve the previous leader's snapshot until the first refresh finishes
+                        self._load_snapshot()
+
+                if self.is_leader:
+                    wait = self._refresh_due_slots()
+                else:
+                    self._load_snapshot()
+                    wait = min(self.interval_seconds, 15.0)
+            except Exception as e:
+                print(f"[headlines] Poller error: {e}")
+                wait = self.interval_seconds
+            self._stop.wait(wait)
+
+    def _refresh_due_slots(self) -> float:
+        for key, slot in self.slots.items():
+            if self._stop.is_set():
+                break
+            if slot["next_due"] <= time.time():
+                self._refresh_slot(key, slot)
+
+        self._write_snapshot()
+        next_due = min(slot["next_due"] for slot in self.slots.values())
+        return max(1.0, next_due - time.time())
+
+    def _refresh_slot(self, key: str, slot: Dict) -> None:
+        result = self.client.get_top_headlines(
+            country=slot["country"],
+            language=slot["language"],
+            page_size=self.client.max_page_size,
+            priority="background",
+        )
+        now = time.time()
+        with self._snapshot_lock:
+            entry = dict(self._snapshot.get(key) or {"articles": [], "fetched_at": None})
+
+        if result.get("status") == "success":
+            slot["failures"] = 0
+            delay = self.interval_seconds
+            entry.update(articles=result["articles"], fetched_at=now, last_error=None,
+                         upstream_stale=bool(result.get("stale")))
+        elif result.get("budget_exhausted"):
+            # Live traffic holds the budget for now; nothing failed upstream, so retry once tokens refill
+            delay = max(1.0, result.get("retry_after") or 0.0)
+            entry["last_error"] = result.get("message")
+        else:
+            slot["failures"] += 1
+            delay = min(self.max_backoff_seconds, self.interval_seconds * (2 ** slot["failures"]))
+            delay = max(delay, result.get("retry_after") or 0.0)
+            entry["last_error"] = result.get("message")
+
+        slot["next_due"] = now + delay * (1 + random.uniform(-self.jitter, self.jitter))
+        entry.update(failures=slot["failures"], next_refresh_at=slot["next_due"])
+        with self._snapshot_lock:
+            self._snapshot[key] = entry
+
+    def _write_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        with self._snapshot_lock:
+            body = json.dumps(self._snapshot)
+
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.write(body)
+        os.replace(temp_path, self.snapshot_path)
+
+    def _load_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        try:
+            mtime = os.stat(self.snapshot_path).st_mtime
+        except OSError:
+            return
+        if mtime == self._snapshot_mtime:
+            return
+
+        with open(self.snapshot_path, encoding="utf-8") as handle:
+            snapshot = json.load(handle)
+        with self._snapshot_lock:
+            self._snapshot = snapshot
+            self._snapshot_mtime = mtime
+
+    def get(self, country: Optional[str], language: str) -> Optional[Dict]:
+        """Snapshot articles and freshness for a slot, or None when missing or too old to serve"""
+        key = self.slot_key(self.client._normalize_country(country), language)
+        with self._snapshot_lock:
+            entry = self._snapshot.get(key)
+        if not entry or not entry.get("fetched_at"):
+            return None
+
+        now = time.time()
+        age_seconds = now - entry["fetched_at"]
+        if age_seconds > self.max_age_seconds:
+            return None
+
+        return {
+            "articles": entry["articles"],
+            "freshness": {
+                "slot": key,
+                "fetched_at": _isoformat(entry["fetched_at"]),
+                "age_seconds": round(age_seconds, 1),
+                "next_refresh_in_seconds": round(max(0.0, (entry.get("next_refresh_at") or now) - now), 1),
+                "consecutive_failures": entry.get("failures", 0),
+                "last_error": entry.get("last_error"),
+                "upstream_stale": entry.get("upstream_stale", False),
+            },
+        }
+
+    def stats(self) -> Dict:
+        now = time.time()
+        with self._snapshot_lock:
+            slots = {
+                key: {
+                    "articles": len(entry.get("articles", [])),
+                    "age_seconds": round(now - entry["fetched_at"], 1) if entry.get("fetched_at") else None,
+                    "consecutive_failures": entry.get("failures", 0),
+                }
+                for key, entry in self._snapshot.items()
+            }
+        return {
+            "leader": self.is_leader,
+            "interval_seconds": self.interval_seconds,
+            "max_age_seconds": self.max_age_seconds,
+            "slots": slots,
+        }
@@ -1,12 +1,23 @@
 import json
 from typing import List, Dict, Optional
 import os
+import time
 from datetime import datetime
 
-try:
-    from openai import OpenAI  # pyright: ignore[reportMissingImports]
-except ImportError:
-    OpenAI = None
+from .circuit_breaker import CircuitBreaker
+
+
+def _create_openai_client(api_key: str):
+    """Import the OpenAI SDK only when a key is configured"""
+    try:
+        from openai import OpenAI  # pyright: ignore[reportMissingImports]
+    except ImportError:
+        return None
+    return OpenAI(
+        api_key=api_key,
+        timeout=float(os.getenv("OPENAI_TIMEOUT_SECONDS", "10")),
+        max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "1")),
+    )
 
 class LLMCategorizer:
     def __init__(self, model: str = "gpt-4o-mini", api_key: Optional[str] = None):
@@ -17,15 +28,39 @@ class LLMCategorizer:
         self.model = model
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         
-        if self.api_key and OpenAI:
-            self.client = OpenAI(api_key=self.api_key)
+        self.client = _create_openai_client(self.api_key) if self.api_key else None
+        # Slow or failing completions open the circuit and searches use keyword fallback meanwhile
+        self.breaker = CircuitBreaker(
+            "openai",
+            failure_threshold=int(os.getenv("OPENAI_BREAKER_FAILURES", "3")),
+            recovery_seconds=float(os.getenv("OPENAI_BREAKER_RECOVERY_SECONDS", "60")),
+        )
+        self.slow_call_seconds = float(os.getenv("OPENAI_SLOW_CALL_SECONDS", "5"))
+        if self.client:
             self.use_llm = True
             print(f"🤖 Initialized LLM Categorizer with {model}")
         else:
-            self.client = None
             self.use_llm = False
             print("⚠️  No OpenAI API key found, using fallback keyword categorization")
 
+    def _create_completion(self, **kwargs):
+        """Call the chat completions API through the circuit breaker; None while the circuit is open"""
+        if not self.breaker.allow():
+            return None
+
+        started = time.perf_counter()
+        try:
+            response = self.client.chat.completions.create(model=self.model, **kwargs)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        if time.perf_counter() - started > self.slow_call_seconds:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
     def _normalize_category(self, value: str, allowed_categories: List[str]) -> str:
         default_category = "top" if "top" in allowed_categories else ("general" if "general" in allowed_categories else allowed_categories[-1] if allowed_categories else "general")
 
@@ -66,8 +101,7 @@ Return JSON only in this shape:
             return self._fallback_category_classification(text, normalized_categories)
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = self._create_completion(
                 messages=[
                     {"role": "system", "content": "You classify news queries into a single category."},
                     {"role": "user", "content": self._build_category_prompt(text, normalized_categories, context)},
@@ -76,6 +110,8 @@ Return JSON only in this shape:
                 max_tokens=120,
                 response_format={"type": "json_object"},
             )
+            if response is None:
+                return self._fallback_category_classification(text, normalized_categories)
 
             content = response.choices[0].message.content or "{}"
             result = json.loads(content)
@@ -139,8 +175,7 @@ Return JSON only in this shape:
             prompt = self._create_categorization_prompt(title, description, query)
             
             # Call GPT-4o mini
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = self._create_completion(
                 messages=[
                     {"role": "system", "content": "You are a news categorization expert. Analyze articles and categorize them accurately."},
                     {"role": "user", "content": prompt}
@@ -149,6 +184,8 @@ Return JSON only in this shape:
                 temperature=0.1,
                 response_format={"type": "json_object"}
             )
+            if response is None:
+                return self._fallback_categorization(title, description, query)
             
             # Parse response
             categorization_text = response.choices[0].message.content.strip()
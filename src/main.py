@@ -1,12 +1,13 @@
 import os
 from datetime import datetime, timedelta, timezone
 import hashlib
+import math
 
 from fastapi import Depends, FastAPI, HTTPException, Query
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import bcrypt
 from sqlalchemy.orm import Session
@@ -14,9 +15,13 @@ from sqlalchemy.exc import ProgrammingError
 from typing import List, Optional, Union
 import json
 import asyncio
+from .executors import ExecutorOverloaded, executor_stats, get_executor, offload, shutdown_executors
+from .feed_materializer import FeedMaterializer
+from .headline_poller import HeadlinePoller
 from .newsdata_client import NewsDataClient
-from .database import get_db, init_db
+from .database import SessionLocal, get_db, init_db
 from .models import SavedArticle, SearchHistory, User, UserInterest, UserLocation
+from .user_context import UserContextCache, load_user_context
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -43,18 +48,53 @@ news_client = NewsDataClient(
     openai_api_key=OPENAI_API_KEY
 )
 
+# Background headline refresh; endpoints serve from its snapshot while fresh
+HEADLINE_POLL_ENABLED = os.getenv("HEADLINE_POLL_ENABLED", "false").lower() in {"1", "true", "yes"}
+headline_poller = HeadlinePoller(
+    news_client,
+    countries=[value.strip() for value in os.getenv("HEADLINE_POLL_COUNTRIES", "").split(",")],
+    languages=[value.strip() for value in os.getenv("HEADLINE_POLL_LANGUAGES", "en").split(",") if value.strip()],
+    interval_seconds=float(os.getenv("HEADLINE_POLL_INTERVAL_SECONDS", "300")),
+    jitter=float(os.getenv("HEADLINE_POLL_JITTER", "0.1")),
+    max_backoff_seconds=float(os.getenv("HEADLINE_POLL_MAX_BACKOFF_SECONDS", "1800")),
+    max_age_seconds=float(os.getenv("HEADLINE_SNAPSHOT_MAX_AGE_SECONDS", "0")) or None,
+    lock_path=os.getenv("HEADLINE_POLL_LOCK", os.path.join(".cache", "headline_poller.lock")),
+    snapshot_path=os.getenv("HEADLINE_SNAPSHOT_PATH", os.path.join(".cache", "headlines_snapshot.json")),
+) if HEADLINE_POLL_ENABLED else None
+
 FEED_CACHE: dict = {}
 FEED_CACHE_MAX_ITEMS = int(os.getenv("FEED_CACHE_MAX_ITEMS", "50"))
 FEED_CACHE_TTL_SECONDS = int(os.getenv("FEED_CACHE_TTL_SECONDS", "1800"))
+FEED_CACHE_SOFT_TTL_SECONDS = int(os.getenv("FEED_CACHE_SOFT_TTL_SECONDS", "300"))
+FEED_CACHE_STALE_WHILE_REVALIDATE = os.getenv("FEED_CACHE_STALE_WHILE_REVALIDATE", "true").lower() in {"1", "true", "yes"}
+# Background refreshes of stale cached feeds, one per cache key
+FEED_REFRESHES: dict = {}
+FEED_MATERIALIZE_ENABLED = os.getenv("FEED_MATERIALIZE_ENABLED", "false").lower() in {"1", "true", "yes"}
 FEED_UPSTREAM_ATTEMPTS = int(os.getenv("FEED_UPSTREAM_ATTEMPTS", "4"))
 FEED_UPSTREAM_RETRY_DELAY_SECONDS = float(os.getenv("FEED_UPSTREAM_RETRY_DELAY_SECONDS", "2.0"))
 FEED_UPSTREAM_BACKOFF_MULTIPLIER = float(os.getenv("FEED_UPSTREAM_BACKOFF_MULTIPLIER", "2.0"))
+FEED_DEADLINE_SECONDS = float(os.getenv("FEED_DEADLINE_SECONDS", "15"))
+
+# Interests, country and recent history per signed-in user, shared by the feed's lookups
+user_contexts = UserContextCache(
+    ttl_seconds=float(os.getenv("USER_CONTEXT_TTL_SECONDS", "60")),
+    max_users=int(os.getenv("USER_CONTEXT_MAX_USERS", "10000")),
+)
 
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change-this-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "120"))
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/signin")
 
+
+@app.exception_handler(ExecutorOverloaded)
+async def executor_overloaded_handler(request, exc: ExecutorOverloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
 # Request models
 class SearchRequest(BaseModel):
     query: str
@@ -262,18 +302,42 @@ def _upsert_user_location(db: Session, user_id: int, payload: Optional[UserLocat
     location.timezone = _to_location_text(payload.timezone)[:64]
 
 
-def _get_user_country_by_email(db: Session, email: Optional[str]) -> str:
+def _get_user_context(db: Session, email: Optional[str]) -> Optional[dict]:
+    """User interests, country and recent history, memoized on the request's session and cached per user"""
     if not email:
-        return ""
+        return None
 
-    try:
-        user = _get_user_by_email(db, email)
-        if not user or not user.location:
-            return ""
-        return _normalize_country_code(user.location.country_code)
-    except ProgrammingError:
-        db.rollback()
+    normalized_email = _normalize_email(email)
+    memo = db.info.setdefault("user_contexts", {})
+    if normalized_email in memo:
+        return memo[normalized_email]
+
+    context = user_contexts.get(normalized_email)
+    if context is None:
+        epoch = user_contexts.epoch
+        try:
+            context = load_user_context(db, normalized_email)
+        except ProgrammingError:
+            db.rollback()
+            return None
+        if context is not None:
+            user_contexts.put(normalized_email, context, epoch)
+
+    memo[normalized_email] = context
+    return context
+
+
+def _invalidate_user_context(db: Session, email: str) -> None:
+    normalized_email = _normalize_email(email)
+    db.info.get("user_contexts", {}).pop(normalized_email, None)
+    user_contexts.invalidate(normalized_email)
+
+
+def _get_user_country_by_email(db: Session, email: Optional[str]) -> str:
+    context = _get_user_context(db, email)
+    if not context:
         return ""
+    return _normalize_country_code(context["country_code"])
 
 
 def _get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
@@ -298,25 +362,14 @@ def _enforce_user_scope(path_email: str, current_user: User) -> None:
 
 
 def _extract_history_terms(db: Session, email: Optional[str], limit: int = 8) -> List[str]:
-    if not email:
+    context = _get_user_context(db, email)
+    if not context:
         return []
 
-    user = _get_user_by_email(db, email)
-    if not user:
-        return []
-
-    entries = (
-        db.query(SearchHistory)
-        .filter(SearchHistory.user_id == user.id)
-        .order_by(SearchHistory.searched_at.desc())
-        .limit(limit)
-        .all()
-    )
-
     terms = []
     seen = set()
-    for item in entries:
-        for token in item.query.lower().split():
+    for query in context["history"][:limit]:
+        for token in query.lower().split():
             token = token.strip()
             if len(token) < 3:
                 continue
@@ -391,6 +444,22 @@ def _select_with_source_cap(
     return selected
 
 
+def _raise_for_upstream_error(result: dict) -> None:
+    """Map a NewsData error result to an HTTPException, passing 429/503 and Retry-After through"""
+    if result.get("rate_limited") or result.get("circuit_open") or result.get("overloaded"):
+        retry_after = result.get("retry_after")
+        headers = {"Retry-After": str(math.ceil(retry_after))} if retry_after else None
+        status_code = 429 if result.get("rate_limited") else 503
+        raise HTTPException(status_code=status_code, detail=result["message"], headers=headers)
+    raise HTTPException(status_code=500, detail=result["message"])
+
+
+def _load_feed_context(request: SearchRequest, db: Session):
+    history_terms = _extract_history_terms(db, request.user_email)
+    resolved_country = _normalize_country_code(request.country) or _get_user_country_by_email(db, request.user_email)
+    return history_terms, resolved_country, _build_feed_cache_key(request, db)
+
+
 def _build_feed_cache_key(request: SearchRequest, db: Session) -> str:
     interests = request.interests or []
     history_terms = _extract_history_terms(db, request.user_email)
@@ -413,6 +482,7 @@ def _build_cached_feed_page(cached_response: dict, page: int, per_page: int, ups
     page_articles = all_articles[start_idx:end_idx]
 
     response = dict(cached_response)
+    response.pop("all_articles", None)
     response["articles"] = page_articles
     response["live_recommendations"] = page_articles
     response["count"] = len(all_articles)
@@ -425,7 +495,7 @@ def _build_cached_feed_page(cached_response: dict, page: int, per_page: int, ups
     return response
 
 
-def _get_cached_feed(cache_key: str) -> Optional[dict]:
+def _get_cached_feed_entry(cache_key: str) -> Optional[dict]:
     cached = FEED_CACHE.get(cache_key)
     if not cached:
         return None
@@ -439,11 +509,34 @@ def _get_cached_feed(cache_key: str) -> Optional[dict]:
         FEED_CACHE.pop(cache_key, None)
         return None
 
-    return cached.get("response")
+    return cached
+
+
+def _get_cached_feed(cache_key: str) -> Optional[dict]:
+    cached = _get_cached_feed_entry(cache_key)
+    return cached.get("response") if cached else None
+
+
+def _with_cache_age(response: dict, cache_key: str) -> dict:
+    """Add how old the cached feed is and whether a refresh is running"""
+    cached = FEED_CACHE.get(cache_key)
+    if not cached:
+        return response
+
+    age_seconds = (datetime.now(timezone.utc) - cached["stored_at"]).total_seconds()
+    response["cache"] = {
+        "stored_at": cached["stored_at"].isoformat(),
+        "age_seconds": round(age_seconds, 1),
+        "state": "fresh" if age_seconds <= FEED_CACHE_SOFT_TTL_SECONDS else "stale",
+        "soft_ttl_seconds": FEED_CACHE_SOFT_TTL_SECONDS,
+        "hard_ttl_seconds": FEED_CACHE_TTL_SECONDS,
+        "refreshing": cache_key in FEED_REFRESHES,
+    }
+    return response
 
 
 def _store_cached_feed(cache_key: str, response_data: dict) -> None:
-    if len(FEED_CACHE) >= FEED_CACHE_MAX_ITEMS:
+    if cache_key not in FEED_CACHE and len(FEED_CACHE) >= FEED_CACHE_MAX_ITEMS:
         oldest_key = min(FEED_CACHE.items(), key=lambda item: item[1].get("stored_at", datetime.now(timezone.utc)))[0]
         FEED_CACHE.pop(oldest_key, None)
 
@@ -453,189 +546,284 @@ def _store_cached_feed(cache_key: str, response_data: dict) -> None:
     }
 
 
-@app.post("/api/feed")
-async def get_personalized_feed(request: SearchRequest, db: Session = Depends(get_db)):
-    try:
-        interests = request.interests or []
-        history_terms = _extract_history_terms(db, request.user_email)
-        resolved_country = _normalize_country_code(request.country) or _get_user_country_by_email(db, request.user_email)
-        cache_key = _build_feed_cache_key(request, db)
-
-        focus_tokens = []
-        seen_tokens = set()
-        for token in interests + history_terms:
-            normalized = token.strip().lower()
-            if not normalized or normalized in seen_tokens:
-                continue
-            seen_tokens.add(normalized)
-            focus_tokens.append(token)
-            if len(focus_tokens) >= 10:
+async def _fetch_feed(request: SearchRequest, history_terms: List[str], resolved_country: str,
+                      priority: str = "feed") -> tuple:
+    """
+    Fetch the personalized and general legs and combine them into a full feed.
+
+    Returns the cacheable feed (every combined article, as page 1) and the
+    upstream Retry-After, if any leg was refused.
+    """
+    focus_tokens = []
+    seen_tokens = set()
+    for token in (request.interests or []) + history_terms:
+        normalized = token.strip().lower()
+        if not normalized or normalized in seen_tokens:
+            continue
+        seen_tokens.add(normalized)
+        focus_tokens.append(token)
+        if len(focus_tokens) >= 10:
+            break
+
+    focus_query = " ".join(focus_tokens) if focus_tokens else (request.query or "news")
+    required_total = request.page * request.per_page
+    personalized_fetch_size = max(20, required_total + 12)
+    general_fetch_size = max(30, required_total + 25)
+
+    # Both legs share one deadline; neither retries past it
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max(1.0, FEED_DEADLINE_SECONDS)
+
+    async def _search_news_with_buffer(**kwargs) -> dict:
+        attempts = max(1, FEED_UPSTREAM_ATTEMPTS)
+        fallback_result = {
+            "status": "error",
+            "message": "No upstream response",
+            "articles": [],
+        }
+        retry_delay = max(0.0, FEED_UPSTREAM_RETRY_DELAY_SECONDS)
+
+        for attempt_index in range(attempts):
+            result = await news_client.asearch_news(**kwargs)
+            if result.get("status") != "error" and result.get("articles"):
+                return result
+
+            fallback_result = result
+            # The scheduler, circuit breaker or executors already refused the call; retrying only burns time
+            if result.get("rate_limited") or result.get("circuit_open") or result.get("overloaded"):
                 break
+            if attempt_index < attempts - 1:
+                if loop.time() + retry_delay >= deadline:
+                    break
+                await asyncio.sleep(retry_delay)
+                retry_delay = retry_delay * max(1.0, FEED_UPSTREAM_BACKOFF_MULTIPLIER)
+
+        return fallback_result
+
+    personalized_task = asyncio.create_task(_search_news_with_buffer(
+        query=focus_query,
+        interests=request.interests or [],
+        country=resolved_country,
+        language=request.language,
+        page_size=personalized_fetch_size,
+        page=1,
+        per_page=personalized_fetch_size,
+        priority=priority,
+    ))
+    general_task = asyncio.create_task(_search_news_with_buffer(
+        query="latest news",
+        interests=None,
+        country=resolved_country,
+        language=request.language,
+        page_size=general_fetch_size,
+        page=1,
+        per_page=general_fetch_size,
+        priority=priority,
+    ))
+
+    # If upstream is throttling, stop the general leg; it would only fail too.
+    throttled = False
+
+    def _stop_general_if_throttled(task: asyncio.Task) -> None:
+        nonlocal throttled
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if result.get("status") == "error" and (result.get("rate_limited") or result.get("circuit_open")):
+            throttled = True
+            general_task.cancel()
+
+    personalized_task.add_done_callback(_stop_general_if_throttled)
+    _, pending = await asyncio.wait({personalized_task, general_task}, timeout=max(0.0, deadline - loop.time()))
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def _leg_result(task: asyncio.Task, label: str) -> dict:
+        if task.cancelled():
+            return {"status": "error", "message": f"{label} exceeded the {FEED_DEADLINE_SECONDS:g}s feed deadline", "articles": []}
+        if task.exception() is not None:
+            return {"status": "error", "message": f"{label} failed: {task.exception()}", "articles": []}
+        return task.result()
+
+    personalized_result = _leg_result(personalized_task, "Personalized feed")
+    personalized_error = personalized_result.get("status") == "error"
+
+    if throttled and general_task.cancelled():
+        # Only when the cancel landed; a general leg that already finished is still served
+        general_result = {"status": "success", "articles": []}
+    else:
+        general_result = _leg_result(general_task, "General feed")
+    general_error = general_result.get("status") == "error"
+
+    personalized_articles = sorted(
+        _dedupe_articles(personalized_result.get("articles", [])),
+        key=lambda item: item.get("final_score", 0),
+        reverse=True,
+    )
+    general_articles = _dedupe_articles(general_result.get("articles", []))
 
-        focus_query = " ".join(focus_tokens) if focus_tokens else (request.query or "news")
-        required_total = request.page * request.per_page
-        personalized_fetch_size = max(20, required_total + 12)
-        general_fetch_size = max(30, required_total + 25)
-
-        async def _search_news_with_buffer(**kwargs) -> dict:
-            attempts = max(1, FEED_UPSTREAM_ATTEMPTS)
-            fallback_result = {
-                "status": "error",
-                "message": "No upstream response",
-                "articles": [],
-            }
-            retry_delay = max(0.0, FEED_UPSTREAM_RETRY_DELAY_SECONDS)
+    personalized_lead = min(8, request.per_page)
+    if request.per_page >= 6:
+        personalized_lead = min(8, max(6, personalized_lead))
 
-            for attempt_index in range(attempts):
-                result = news_client.search_news(**kwargs)
-                if result.get("status") != "error" and result.get("articles"):
-                    return result
+    lead_personalized = _select_with_source_cap(
+        personalized_articles,
+        max_items=personalized_lead,
+        max_per_source=2,
+        relax_if_needed=True,
+    )
+    lead_keys = {_article_dedupe_key(article) for article in lead_personalized}
 
-                fallback_result = result
-                if attempt_index < attempts - 1:
-                    await asyncio.sleep(retry_delay)
-                    retry_delay = retry_delay * max(1.0, FEED_UPSTREAM_BACKOFF_MULTIPLIER)
+    lead_source_counts = {}
+    for article in lead_personalized:
+        source = _source_key(article)
+        lead_source_counts[source] = lead_source_counts.get(source, 0) + 1
 
-            return fallback_result
+    filtered_general = [
+        article for article in general_articles
+        if _article_dedupe_key(article) not in lead_keys
+    ]
 
-        personalized_result = await _search_news_with_buffer(
-            query=focus_query,
-            interests=interests,
-            country=resolved_country,
-            language=request.language,
-            page_size=personalized_fetch_size,
-            page=1,
-            per_page=personalized_fetch_size,
-        )
-        personalized_error = personalized_result.get("status") == "error"
+    balanced_general = _select_with_source_cap(
+        filtered_general,
+        max_items=len(filtered_general),
+        max_per_source=2,
+        existing_source_counts=lead_source_counts,
+        relax_if_needed=True,
+    )
 
-        general_result = {"status": "success", "articles": []}
-        general_error = False
-
-        # If upstream is throttling, avoid a second request that will likely fail too.
-        if not personalized_error:
-            general_result = await _search_news_with_buffer(
-                query="latest news",
-                interests=None,
-                country=resolved_country,
-                language=request.language,
-                page_size=general_fetch_size,
-                page=1,
-                per_page=general_fetch_size,
-            )
-            general_error = general_result.get("status") == "error"
-        else:
-            personalized_message = (personalized_result.get("message") or "").lower()
-            if "429" not in personalized_message and "too many requests" not in personalized_message:
-                general_result = await _search_news_with_buffer(
-                    query="latest news",
-                    interests=None,
-                    country=resolved_country,
-                    language=request.language,
-                    page_size=general_fetch_size,
-                    page=1,
-                    per_page=general_fetch_size,
-                )
-                general_error = general_result.get("status") == "error"
-
-        personalized_articles = sorted(
-            _dedupe_articles(personalized_result.get("articles", [])),
-            key=lambda item: item.get("final_score", 0),
-            reverse=True,
-        )
-        general_articles = _dedupe_articles(general_result.get("articles", []))
+    combined = _dedupe_articles(lead_personalized + balanced_general)
+
+    errors = []
+    if personalized_error:
+        errors.append(personalized_result.get("message", "Personalized feed failed"))
+    if general_error:
+        errors.append(general_result.get("message", "General feed failed"))
+
+    feed = {
+        "query": focus_query,
+        "count": len(combined),
+        "all_articles": combined,
+        "articles": combined,
+        "live_recommendations": combined,
+        "page": 1,
+        "per_page": request.per_page,
+        "has_more": len(combined) > request.per_page,
+        "personalized_lead": min(personalized_lead, len(lead_personalized)),
+        "source_diversity_enabled": True,
+        "history_terms_used": history_terms,
+        "country": resolved_country,
+        "api_source": "newsdata.io",
+        "llm_categorized": True,
+        "upstream_errors": errors,
+    }
+    retry_after = personalized_result.get("retry_after") or general_result.get("retry_after")
+    return feed, retry_after
 
-        personalized_lead = min(8, request.per_page)
-        if request.per_page >= 6:
-            personalized_lead = min(8, max(6, personalized_lead))
 
-        lead_personalized = _select_with_source_cap(
-            personalized_articles,
-            max_items=personalized_lead,
-            max_per_source=2,
-            relax_if_needed=True,
-        )
-        lead_keys = {_article_dedupe_key(article) for article in lead_personalized}
+async def _refresh_feed(cache_key: str, request: SearchRequest, history_terms: List[str], resolved_country: str) -> None:
+    try:
+        feed, _ = await _fetch_feed(request, history_terms, resolved_country, priority="background")
+        if feed["all_articles"]:
+            _store_cached_feed(cache_key, feed)
+    except Exception as exc:
+        print(f"[feed] Background refresh failed: {exc}")
 
-        lead_source_counts = {}
-        for article in lead_personalized:
-            source = _source_key(article)
-            lead_source_counts[source] = lead_source_counts.get(source, 0) + 1
 
-        filtered_general = [
-            article for article in general_articles
-            if _article_dedupe_key(article) not in lead_keys
-        ]
+def _schedule_feed_refresh(cache_key: str, request: SearchRequest, history_terms: List[str], resolved_country: str) -> None:
+    """Refresh a stale cached feed in the background, at most once at a time per key"""
+    if cache_key in FEED_REFRESHES:
+        return
+    task = asyncio.create_task(_refresh_feed(cache_key, request, history_terms, resolved_country))
+    FEED_REFRESHES[cache_key] = task
+    task.add_done_callback(lambda _: FEED_REFRESHES.pop(cache_key, None))
 
-        balanced_general = _select_with_source_cap(
-            filtered_general,
-            max_items=len(filtered_general),
-            max_per_source=2,
-            existing_source_counts=lead_source_counts,
-            relax_if_needed=True,
-        )
 
-        combined = _dedupe_articles(lead_personalized + balanced_general)
+def _load_feed_context_with_session(request: SearchRequest):
+    db = SessionLocal()
+    try:
+        return _load_feed_context(request, db)
+    finally:
+        db.close()
+
+
+async def _materialize_feed(request: SearchRequest) -> tuple:
+    history_terms, resolved_country, cache_key = await get_executor("io").run(_load_feed_context_with_session, request)
+    feed, retry_after = await _fetch_feed(request, history_terms, resolved_country, priority="background")
+    return cache_key, feed, retry_after
+
+
+# Page 1 of the feed precomputed for recently active signed-in users
+feed_materializer = FeedMaterializer(
+    _materialize_feed,
+    news_client.upstream_scheduler,
+    interval_seconds=float(os.getenv("FEED_MATERIALIZE_INTERVAL_SECONDS", "600")),
+    active_window_seconds=float(os.getenv("FEED_MATERIALIZE_ACTIVE_WINDOW_SECONDS", "3600")),
+    max_users=int(os.getenv("FEED_MATERIALIZE_MAX_USERS", "500")),
+    max_builds_per_cycle=int(os.getenv("FEED_MATERIALIZE_MAX_BUILDS_PER_CYCLE", "5")),
+    tick_seconds=float(os.getenv("FEED_MATERIALIZE_TICK_SECONDS", "30")),
+) if FEED_MATERIALIZE_ENABLED else None
+
+
+@app.post("/api/feed")
+async def get_personalized_feed(request: SearchRequest, db: Session = Depends(get_db)):
+    try:
+        # The session is synchronous, so its queries run on the I/O pool
+        history_terms, resolved_country, cache_key = await get_executor("io").run(_load_feed_context, request, db)
+
+        if feed_materializer and request.user_email:
+            email = _normalize_email(request.user_email)
+            feed_materializer.touch(email, request.model_copy(update={"page": 1}))
+            materialized = feed_materializer.get(email, cache_key) if request.page == 1 else None
+            if materialized:
+                response = _build_cached_feed_page(materialized["feed"], request.page, request.per_page)
+                response["served_from"] = "materialized"
+                response["materialized_at"] = datetime.fromtimestamp(materialized["built_at"], tz=timezone.utc).isoformat()
+                return response
+
+        # Stale-while-revalidate: answer from a cached feed that covers the page and is within
+        # the hard TTL, refreshing it in the background once it is past the soft TTL
+        cached = _get_cached_feed_entry(cache_key) if FEED_CACHE_STALE_WHILE_REVALIDATE else None
+        if cached and len(cached["response"].get("all_articles") or []) >= request.page * request.per_page:
+            age_seconds = (datetime.now(timezone.utc) - cached["stored_at"]).total_seconds()
+            if age_seconds > FEED_CACHE_SOFT_TTL_SECONDS:
+                _schedule_feed_refresh(cache_key, request, history_terms, resolved_country)
+            response = _build_cached_feed_page(cached["response"], request.page, request.per_page)
+            return _with_cache_age(response, cache_key)
+
+        feed, retry_after = await _fetch_feed(request, history_terms, resolved_country)
+        if feed["all_articles"]:
+            _store_cached_feed(cache_key, feed)
+
+        combined = feed["all_articles"]
         start_idx = (request.page - 1) * request.per_page
         end_idx = start_idx + request.per_page
         page_articles = combined[start_idx:end_idx]
 
-        has_more = len(combined) > end_idx
-
-        errors = []
-        if personalized_error:
-            errors.append(personalized_result.get("message", "Personalized feed failed"))
-        if general_error:
-            errors.append(general_result.get("message", "General feed failed"))
-
-        live_response = {
-            "query": focus_query,
-            "count": len(combined),
-            "articles": page_articles,
-            "live_recommendations": page_articles,
-            "page": request.page,
-            "per_page": request.per_page,
-            "has_more": has_more,
-            "personalized_lead": min(personalized_lead, len(lead_personalized)),
-            "source_diversity_enabled": True,
-            "history_terms_used": history_terms,
-            "country": resolved_country,
-            "api_source": "newsdata.io",
-            "llm_categorized": True,
-            "upstream_errors": errors,
-        }
-
-        cache_payload = {
-            "query": focus_query,
-            "count": len(combined),
-            "all_articles": combined,
-            "articles": combined,
-            "live_recommendations": combined,
-            "page": 1,
-            "per_page": request.per_page,
-            "has_more": len(combined) > request.per_page,
-            "personalized_lead": min(personalized_lead, len(lead_personalized)),
-            "source_diversity_enabled": True,
-            "history_terms_used": history_terms,
-            "country": resolved_country,
-            "api_source": "newsdata.io",
-            "llm_categorized": True,
-            "upstream_errors": errors,
-        }
-
-        if combined:
-            _store_cached_feed(cache_key, cache_payload)
+        live_response = {key: value for key, value in feed.items() if key != "all_articles"}
+        live_response.update(
+            articles=page_articles,
+            live_recommendations=page_articles,
+            page=request.page,
+            has_more=len(combined) > end_idx,
+        )
 
         if page_articles:
             return live_response
 
         cached_response = _get_cached_feed(cache_key)
         if cached_response:
-            cached_errors = errors or ["Using cached feed due to upstream rate limit"]
-            return _build_cached_feed_page(cached_response, request.page, request.per_page, cached_errors)
+            cached_errors = feed["upstream_errors"] or ["Using cached feed due to upstream rate limit"]
+            response = _build_cached_feed_page(cached_response, request.page, request.per_page, cached_errors)
+            return _with_cache_age(response, cache_key)
 
+        if retry_after:
+            live_response["retry_after"] = retry_after
+            return JSONResponse(content=live_response, headers={"Retry-After": str(math.ceil(retry_after))})
         return live_response
-    except HTTPException:
+    except (HTTPException, ExecutorOverloaded):
         raise
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
@@ -663,11 +851,35 @@ def _provision_user_if_missing(db: Session, email: str, name: Optional[str] = No
 
 @app.on_event("startup")
 def startup_event() -> None:
+    # Model loads in the background so auth/bookmark/history routes serve immediately
+    news_client.start_model_loading()
     init_db()
+    if headline_poller:
+        headline_poller.start()
+
+
+@app.on_event("startup")
+async def start_feed_materializer() -> None:
+    # Runs on the event loop: the feed pipeline shares the async NewsData client
+    if feed_materializer:
+        feed_materializer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    if headline_poller:
+        headline_poller.stop()
+    if feed_materializer:
+        feed_materializer.stop()
+    for task in list(FEED_REFRESHES.values()):
+        task.cancel()
+    await news_client.aclose()
+    shutdown_executors()
 
 
 @app.post("/api/auth/signup")
-async def sign_up(request: SignUpRequest, db: Session = Depends(get_db)):
+@offload("io")
+def sign_up(request: SignUpRequest, db: Session = Depends(get_db)):
     existing_user = _get_user_by_email(db, request.email)
     if existing_user:
         raise HTTPException(status_code=409, detail="Email already registered")
@@ -700,7 +912,8 @@ async def sign_up(request: SignUpRequest, db: Session = Depends(get_db)):
 
 
 @app.post("/api/auth/signin")
-async def sign_in(request: SignInRequest, db: Session = Depends(get_db)):
+@offload("io")
+def sign_in(request: SignInRequest, db: Session = Depends(get_db)):
     user = _get_user_by_email(db, request.email)
     if not user or not _verify_password(request.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid email or password")
@@ -711,6 +924,8 @@ async def sign_in(request: SignInRequest, db: Session = Depends(get_db)):
     _upsert_user_location(db, user.id, request.location)
     db.commit()
     db.refresh(user)
+    if request.location is not None:
+        _invalidate_user_context(db, user.email)
 
     token = _create_access_token(user.email)
 
@@ -738,7 +953,8 @@ async def sign_in_alias(request: SignInRequest, db: Session = Depends(get_db)):
 
 
 @app.put("/api/users/{email}/profile")
-async def update_profile(
+@offload("io")
+def update_profile(
     email: str,
     request: UpdateProfileRequest,
     db: Session = Depends(get_db),
@@ -762,7 +978,8 @@ async def update_profile(
 
 
 @app.get("/api/users/{email}/location")
-async def get_user_location(
+@offload("io")
+def get_user_location(
     email: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(_get_current_user),
@@ -786,7 +1003,8 @@ async def get_user_location(
 
 
 @app.put("/api/users/{email}/location")
-async def update_user_location(
+@offload("io")
+def update_user_location(
     email: str,
     request: UpdateLocationRequest,
     db: Session = Depends(get_db),
@@ -807,6 +1025,9 @@ async def update_user_location(
     _upsert_user_location(db, user.id, location_payload)
     db.commit()
     db.refresh(user)
+    _invalidate_user_context(db, user.email)
+    if feed_materializer:
+        feed_materializer.invalidate(user.email)
 
     location = user.location
     return {
@@ -824,7 +1045,8 @@ async def update_user_location(
 
 
 @app.get("/api/users/{email}/interests")
-async def get_user_interests(
+@offload("io")
+def get_user_interests(
     email: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(_get_current_user),
@@ -840,7 +1062,8 @@ async def get_user_interests(
 
 
 @app.put("/api/users/{email}/interests")
-async def update_user_interests(
+@offload("io")
+def update_user_interests(
     email: str,
     request: UpdateInterestsRequest,
     db: Session = Depends(get_db),
@@ -861,6 +1084,9 @@ async def update_user_interests(
     for interest in normalized_interests:
         db.add(UserInterest(user_id=user.id, interest=interest))
     db.commit()
+    _invalidate_user_context(db, user.email)
+    if feed_materializer:
+        feed_materializer.invalidate(user.email)
 
     return {
         "message": "Interests updated",
@@ -869,7 +1095,8 @@ async def update_user_interests(
 
 
 @app.get("/api/users/{email}/history")
-async def get_user_history(
+@offload("io")
+def get_user_history(
     email: str,
     limit: int = Query(default=50, ge=1, le=200),
     db: Session = Depends(get_db),
@@ -902,7 +1129,8 @@ async def get_user_history(
 
 
 @app.post("/api/users/{email}/history")
-async def add_user_history(
+@offload("io")
+def add_user_history(
     email: str,
     request: AddHistoryRequest,
     db: Session = Depends(get_db),
@@ -919,6 +1147,7 @@ async def add_user_history(
     db.add(history)
     db.commit()
     db.refresh(history)
+    _invalidate_user_context(db, user.email)
 
     return {
         "message": "History saved",
@@ -932,7 +1161,8 @@ async def add_user_history(
 
 
 @app.delete("/api/users/{email}/history")
-async def clear_user_history(
+@offload("io")
+def clear_user_history(
     email: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(_get_current_user),
@@ -942,11 +1172,13 @@ async def clear_user_history(
 
     db.query(SearchHistory).filter(SearchHistory.user_id == user.id).delete()
     db.commit()
+    _invalidate_user_context(db, user.email)
     return {"message": "History cleared"}
 
 
 @app.get("/api/users/{email}/bookmarks")
-async def get_user_bookmarks(
+@offload("io")
+def get_user_bookmarks(
     email: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(_get_current_user),
@@ -978,7 +1210,8 @@ async def get_user_bookmarks(
 
 
 @app.post("/api/users/{email}/bookmarks")
-async def save_user_bookmark(
+@offload("io")
+def save_user_bookmark(
     email: str,
     request: SaveBookmarkRequest,
     db: Session = Depends(get_db),
@@ -1011,7 +1244,8 @@ async def save_user_bookmark(
 
 
 @app.delete("/api/users/{email}/bookmarks")
-async def remove_user_bookmark(
+@offload("io")
+def remove_user_bookmark(
     email: str,
     url: str = Query(..., min_length=1),
     db: Session = Depends(get_db),
@@ -1049,32 +1283,58 @@ async def root():
             "search": "/api/search",
             "headlines": "/api/headlines", 
             "categories": "/api/categories",
-            "health": "/api/health"
+            "health": "/api/health",
+            "ready": "/api/ready"
         }
     }
 
 @app.get("/api/health")
-async def health_check():
-    """Health check endpoint"""
+@offload("io")
+def health_check():
+    """Health check endpoint; several stats read SQLite, so it runs on the io pool"""
     return {
         "status": "healthy",
         "api_version": "2.0.0",
-        "newsdata_api": "connected",
+        "newsdata_api": "configured" if NEWSDATA_API_KEY else "missing_api_key",
+        "similarity_model": news_client.get_model_status(),
         "features": {
             "llm_categorization": bool(OPENAI_API_KEY),
             "relevance_scoring": True,
             "streaming": True,
             "deduplication": True
-        }
+        },
+        "caches": {
+            "query_embeddings": news_client.get_query_cache_stats(),
+            "upstream_responses": news_client.get_upstream_cache_stats(),
+            "upstream_coalescing": news_client.get_coalescing_stats(),
+            "search_sessions": news_client.get_search_session_stats(),
+            "article_dedupe": news_client.get_dedupe_stats(),
+            "article_index": news_client.get_article_index_stats(),
+            "ann_index": news_client.get_ann_index_stats(),
+            "user_context": user_contexts.stats(),
+        },
+        "upstream_budget": news_client.get_scheduler_stats(),
+        "circuits": news_client.get_circuit_stats(),
+        "executors": executor_stats(),
+        "headline_poller": headline_poller.stats() if headline_poller else {"enabled": False},
+        "feed_materializer": feed_materializer.stats() if feed_materializer else {"enabled": False},
     }
 
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness check: 200 once the similarity model is loaded and warmed up"""
+    model_status = news_client.get_model_status()
+    if model_status["state"] != "ready":
+        return JSONResponse(status_code=503, content={"status": "not_ready", "similarity_model": model_status})
+    return {"status": "ready", "similarity_model": model_status}
+
 @app.post("/api/search")
 async def search_articles(request: SearchRequest):
     """
     Search for articles using NewsData.io API with LLM categorization and relevance scoring
     """
     try:
-        result = news_client.search_news(
+        result = await news_client.asearch_news(
             query=request.query,
             category=request.category,
             country=request.country,
@@ -1082,11 +1342,12 @@ async def search_articles(request: SearchRequest):
             page_size=request.top_k,
             interests=request.interests,
             page=request.page,
-            per_page=request.per_page
+            per_page=request.per_page,
+            priority="interactive",
         )
         
         if result["status"] == "error":
-            raise HTTPException(status_code=500, detail=result["message"])
+            _raise_for_upstream_error(result)
         
         return {
             "query": request.query,
@@ -1100,9 +1361,13 @@ async def search_articles(request: SearchRequest):
             "per_page": result.get("per_page", request.per_page),
             "has_more": result.get("has_more", False),
             "api_source": "newsdata.io",
-            "llm_categorized": True
+            "llm_categorized": True,
+            "served_from": result.get("served_from", "live"),
+            "upstream_error": result.get("upstream_error"),
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1117,7 +1382,7 @@ async def search_articles_stream(request: SearchRequest):
             yield f"data: {json.dumps({'type': 'start', 'message': 'Starting search...'})}\n\n"
             
             # Get all articles at once (NewsData.io doesn't support streaming)
-            result = news_client.search_news(
+            result = await news_client.asearch_news(
                 query=request.query,
                 category=request.category,
                 country=request.country,
@@ -1167,15 +1432,30 @@ async def get_top_headlines(request: HeadlinesRequest):
     Get top headlines from NewsData.io API
     """
     try:
-        result = news_client.get_top_headlines(
+        snapshot = headline_poller.get(request.country, request.language) if headline_poller else None
+        if snapshot:
+            articles = snapshot["articles"][:request.top_k]
+            return {
+                "category": request.category,
+                "country": _normalize_country_code(request.country),
+                "count": len(articles),
+                "articles": articles,
+                "api_source": "newsdata.io",
+                "llm_categorized": True,
+                "served_from": "snapshot",
+                "freshness": snapshot["freshness"],
+            }
+
+        result = await news_client.aget_top_headlines(
             category=request.category,
             country=request.country,
             language=request.language,
-            page_size=request.top_k
+            page_size=request.top_k,
+            priority="headlines",
         )
         
         if result["status"] == "error":
-            raise HTTPException(status_code=500, detail=result["message"])
+            _raise_for_upstream_error(result)
         
         return {
             "category": request.category,
@@ -1186,6 +1466,8 @@ async def get_top_headlines(request: HeadlinesRequest):
             "llm_categorized": True
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
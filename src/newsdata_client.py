@@ -1,21 +1,108 @@
 import requests
+import asyncio
+import concurrent.futures
+import importlib.util
 import json
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timezone
 import hashlib
+import threading
 import time
-from sentence_transformers import SentenceTransformer
+import uuid
+import httpx
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from requests.adapters import HTTPAdapter
 from .llm_categorizer import LLMCategorizer
+from .embedding_backends import load_embedding_backend, with_micro_batching
+from .embedding_server import connect_embedding_server
+from .embedding_store import QueryEmbeddingCache, open_embedding_store
+from .search_sessions import open_search_session_store
+from .singleflight import SingleFlight
+from .article_dedupe import DedupeView, RotatingBloomFilter
+from .ann_index import IVFIndex
+from .article_index import open_article_index
+from .circuit_breaker import CircuitBreaker
+from .executors import ExecutorOverloaded, get_executor
+from .upstream_cache import UpstreamResponseCache
+from .upstream_scheduler import UpstreamBudgetExhausted, UpstreamScheduler
 import os
 
+
+class NewsDataRequestError(Exception):
+    """NewsData.io request failed at the transport or HTTP status level"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class NewsDataCircuitOpenError(NewsDataRequestError):
+    """The NewsData circuit breaker is open; the call was not sent upstream"""
+
+
+class NewsDataBudgetError(NewsDataRequestError):
+    """The local upstream budget had no token for this priority in time; the call was not sent upstream"""
+
+
+def _is_upstream_failure(status_code: Optional[int]) -> bool:
+    """Transport errors, throttling and 5xx count against the circuit; other 4xx are our fault"""
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
 class NewsDataClient:
     def __init__(self, api_key: str, use_llm: bool = True, openai_api_key: Optional[str] = None):
         self.api_key = api_key
         self.base_url = "https://newsdata.io/api/1/news"
         self.max_page_size = int(os.getenv("NEWSDATA_MAX_PAGE_SIZE", "10"))
+        self.request_timeout = float(os.getenv("NEWSDATA_TIMEOUT_SECONDS", "30"))
+        self.max_connections = int(os.getenv("NEWSDATA_MAX_CONNECTIONS", "20"))
+
+        # Keep-alive pools: one requests.Session for sync callers, one httpx client per event loop
+        self.http_session = requests.Session()
+        self.http_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections))
+        self._async_http: Optional[httpx.AsyncClient] = None
+
+        # Raw NewsData responses shared by every endpoint that issues the same request
+        self.upstream_cache = UpstreamResponseCache(
+            ttls={
+                "search": float(os.getenv("NEWSDATA_CACHE_TTL_SEARCH", "300")),
+                "headlines": float(os.getenv("NEWSDATA_CACHE_TTL_HEADLINES", "120")),
+            },
+            max_items=int(os.getenv("NEWSDATA_CACHE_MAX_ITEMS", "2000")),
+            db_path=os.getenv("NEWSDATA_CACHE_DB", "").strip(),
+            stale_seconds=float(os.getenv("NEWSDATA_CACHE_STALE_SECONDS", "3600")),
+        )
+
+        # Stop calling NewsData while it keeps failing and serve stale responses instead
+        self.newsdata_breaker = CircuitBreaker(
+            "newsdata",
+            failure_threshold=int(os.getenv("NEWSDATA_BREAKER_FAILURES", "5")),
+            recovery_seconds=float(os.getenv("NEWSDATA_BREAKER_RECOVERY_SECONDS", "30")),
+        )
+
+        # Central token bucket matching the NewsData plan, shared by every caller in this worker
+        self.upstream_scheduler = UpstreamScheduler(
+            rate_per_minute=float(os.getenv("NEWSDATA_RATE_LIMIT_PER_MINUTE", "30")),
+            burst=float(os.getenv("NEWSDATA_RATE_BURST", "10")),
+        )
+
+        # Concurrent identical upstream requests share one in-flight fetch
+        self.upstream_flights = SingleFlight()
+
+        # Upstream pages fetched ahead of scoring while the current page is embedded
+        self.pipeline_lookahead = max(0, int(os.getenv("NEWSDATA_PIPELINE_LOOKAHEAD", "1")))
+        self._prefetch_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, self.max_connections), thread_name_prefix="newsdata-prefetch"
+        )
         self.categories = [
             "business", "entertainment", "environment", "food", 
             "health", "politics", "science", "sports", "technology", 
@@ -42,9 +129,21 @@ class NewsDataClient:
             "general": "top",
         }
         
-        # Initialize SBERT for similarity scoring
-        print("Loading SBERT model for similarity scoring...")
-        self.sbert_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # SBERT for similarity scoring is loaded lazily in the background
+        self.sbert_model_name = 'all-MiniLM-L6-v2'
+        self.encode_batch_size = max(1, int(os.getenv("SBERT_BATCH_SIZE", "32")))
+        self.model_load_timeout = float(os.getenv("SBERT_LOAD_TIMEOUT_SECONDS", "120"))
+        self.sbert_model = None
+        self.embedding_store = None
+        self._model_ready = threading.Event()
+        self._model_lock = threading.Lock()
+        self._model_thread: Optional[threading.Thread] = None
+        self._model_error: Optional[str] = None
+        self._model_load_seconds: Optional[float] = None
+        self.query_embedding_cache = QueryEmbeddingCache(
+            max_bytes=int(os.getenv("QUERY_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+            ttl_seconds=float(os.getenv("QUERY_CACHE_TTL_SECONDS", "3600")),
+        )
         
         # Initialize LLM Categorizer
         self.llm_categorizer = LLMCategorizer(
@@ -52,11 +151,319 @@ class NewsDataClient:
             api_key=openai_api_key
         ) if use_llm else None
         
-        # Cache for deduplication
-        self.seen_urls = set()
-        self.seen_titles = set()
-        self.seen_content_hashes = set()
-        self.search_sessions = {}
+        # Articles served by each search session, in a fixed-size, time-rotated filter shared by all sessions
+        self.article_dedupe = RotatingBloomFilter(
+            capacity=int(os.getenv("DEDUPE_CAPACITY", "50000")),
+            error_rate=float(os.getenv("DEDUPE_ERROR_RATE", "0.001")),
+            rotation_seconds=float(os.getenv("DEDUPE_ROTATION_SECONDS", "3600")),
+        )
+        self.search_sessions = open_search_session_store()
+
+        # Local FTS5 index of every scored article: "fallback" answers searches from it when NewsData
+        # is unavailable, "first" also serves it ahead of upstream when it covers the requested page
+        self.article_index = open_article_index()
+        self.local_search_mode = os.getenv("ARTICLE_INDEX_SEARCH_MODE", "fallback").strip().lower()
+
+        # Semantic (IVF) index over article embeddings, opened once the model's dimension is known.
+        # Inserts run on one background thread so request paths never wait on encoding.
+        self.ann_index: Optional[IVFIndex] = None
+        self.ann_snapshot_path = ""
+        self.ann_snapshot_interval = float(os.getenv("ANN_SNAPSHOT_INTERVAL_SECONDS", "300"))
+        self.ann_min_similarity = float(os.getenv("ANN_MIN_SIMILARITY", "0.3"))
+        self._ann_saved_at = time.monotonic()
+        self._ann_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="ann-ingest")
+
+    def start_model_loading(self) -> None:
+        """Load and warm up the similarity model in a background thread"""
+        with self._model_lock:
+            if self._model_ready.is_set() or (self._model_thread and self._model_thread.is_alive()):
+                return
+            self._model_error = None
+            self._model_thread = threading.Thread(target=self._load_model, name="sbert-loader", daemon=True)
+            self._model_thread.start()
+
+    def _load_model(self) -> None:
+        started = time.perf_counter()
+        try:
+            print("Loading SBERT model for similarity scoring...")
+            sbert_model = with_micro_batching(
+                connect_embedding_server() or load_embedding_backend(self.sbert_model_name),
+                batch_size=self.encode_batch_size,
+            )
+
+            # Article text is immutable, so embeddings are persisted by content hash
+            # Backends produce slightly different vectors, so each gets its own store
+            self.embedding_store = open_embedding_store(
+                f"{self.sbert_model_name}-{sbert_model.name}",
+                sbert_model.get_sentence_embedding_dimension(),
+            )
+
+            self.ann_index = self._open_ann_index(
+                f"{self.sbert_model_name}-{sbert_model.name}",
+                sbert_model.get_sentence_embedding_dimension(),
+            )
+
+            # Warm-up pass so the first real request does not pay for lazy initialization
+            sbert_model.encode(["warm up similarity model"], batch_size=self.encode_batch_size)
+
+            self.sbert_model = sbert_model
+            self._model_load_seconds = time.perf_counter() - started
+            self._model_ready.set()
+            print(f"[model] SBERT ready ({sbert_model.name}) in {self._model_load_seconds:.1f}s")
+        except Exception as e:
+            self._model_error = str(e)
+            print(f"[error] Failed to load SBERT model: {e}")
+
+    def _open_ann_index(self, name: str, dimension: int) -> Optional[IVFIndex]:
+        """Open the ANN index configured by ANN_INDEX_DIR, restoring its snapshot, or None when disabled"""
+        directory = os.getenv("ANN_INDEX_DIR", os.path.join(".cache", "ann_index")).strip()
+        if not directory:
+            return None
+
+        index = IVFIndex(
+            dimension,
+            nlist=int(os.getenv("ANN_NLIST", "64")),
+            nprobe=int(os.getenv("ANN_NPROBE", "8")),
+            max_items=int(os.getenv("ANN_MAX_ARTICLES", "20000")),
+            max_age_seconds=float(os.getenv("ANN_MAX_AGE_SECONDS", str(7 * 24 * 3600))),
+        )
+        self.ann_snapshot_path = os.path.join(directory, f"{name}.npz")
+        try:
+            if index.load(self.ann_snapshot_path):
+                print(f"[ann] Restored {len(index)} article vectors from {self.ann_snapshot_path}")
+        except Exception as e:
+            print(f"[ann] Ignoring unreadable ANN snapshot: {e}")
+        return index
+
+    def _save_ann_index(self) -> None:
+        if self.ann_index is None or not self.ann_snapshot_path:
+            return
+        try:
+            self.ann_index.save(self.ann_snapshot_path)
+        except Exception as e:
+            print(f"[ann] Failed to save ANN snapshot: {e}")
+        self._ann_saved_at = time.monotonic()
+
+    def _get_model(self):
+        """Return the similarity model, waiting for the background load if needed"""
+        if not self._model_ready.is_set():
+            self.start_model_loading()
+            loader = self._model_thread
+            if loader is not None:
+                loader.join(self.model_load_timeout)
+            if not self._model_ready.is_set():
+                raise RuntimeError(self._model_error or "Similarity model is still loading")
+        return self.sbert_model
+
+    def is_model_ready(self) -> bool:
+        return self._model_ready.is_set()
+
+    def get_model_status(self) -> Dict:
+        """Get the similarity model loading state"""
+        if self._model_ready.is_set():
+            state = "ready"
+        elif self._model_error:
+            state = "failed"
+        elif self._model_thread is not None:
+            state = "loading"
+        else:
+            state = "not_started"
+
+        return {
+            "state": state,
+            "model": self.sbert_model_name,
+            "backend": self.sbert_model.name if self.sbert_model is not None else None,
+            "load_seconds": self._model_load_seconds,
+            "error": self._model_error,
+        }
+
+    def _get_async_http(self) -> httpx.AsyncClient:
+        if self._async_http is None or self._async_http.is_closed:
+            self._async_http = httpx.AsyncClient(
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=self.request_timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._async_http
+
+    async def aclose(self) -> None:
+        """Close pooled upstream connections"""
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
+        self.http_session.close()
+        self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        self._ann_executor.shutdown(wait=False, cancel_futures=True)
+        self._save_ann_index()
+
+    def _check_api_status(self, data: Dict) -> Dict:
+        if data.get("status") != "success":
+            raise Exception(f"API Error: {data.get('results', {}).get('message', 'Unknown error')}")
+        return data
+
+    def _rate_limited_error(self, error: Exception, retry_after: Optional[float]) -> NewsDataRequestError:
+        """Translate an upstream 429 into a NewsDataRequestError and back off the scheduler"""
+        self.upstream_scheduler.penalize(retry_after)
+        return NewsDataRequestError(str(error), 429, retry_after)
+
+    def _admit_request(self) -> None:
+        """Refuse the call up front while the NewsData circuit is open"""
+        if not self.newsdata_breaker.allow():
+            retry_after = self.newsdata_breaker.retry_after()
+            raise NewsDataCircuitOpenError(
+                f"NewsData circuit open after repeated failures, retry after {retry_after:.0f}s", 503, retry_after
+            )
+
+    def _decode_response(self, response) -> Dict:
+        try:
+            return response.json()
+        except ValueError as e:
+            # An HTML error page or truncated proxy response: upstream is unhealthy, not our request
+            raise NewsDataRequestError(f"Invalid JSON from NewsData: {e}") from e
+
+    def _record_outcome(self, error: Optional[NewsDataRequestError]) -> None:
+        if error is None:
+            self.newsdata_breaker.record_success()
+        elif _is_upstream_failure(error.status_code):
+            self.newsdata_breaker.record_failure()
+        else:
+            # The request was rejected for its content, which says nothing about upstream health
+            self.newsdata_breaker.record_success()
+
+    def _stale_or_raise(self, params: Dict, error: NewsDataRequestError) -> Dict:
+        """Serve an expired cached response while upstream is unavailable, otherwise re-raise"""
+        if _is_upstream_failure(error.status_code):
+            stale = self.upstream_cache.get_stale(params)
+            if stale is not None:
+                print(f"[cache] Serving stale NewsData response ({error})")
+                return dict(stale, stale=True)
+        raise error
+
+    def _fetch_page(self, params: Dict, timeout: Optional[float] = None, priority: str = "interactive") -> Dict:
+        """GET one NewsData.io page over the pooled sync session"""
+        cached = self.upstream_cache.get(params)
+        if cached is not None:
+            return cached
+
+        key = self.upstream_cache.build_key(params)
+        try:
+            return self.upstream_flights.do(key, lambda: self._request_page(params, timeout, priority))
+        except NewsDataRequestError as e:
+            return self._stale_or_raise(params, e)
+
+    def _request_page(self, params: Dict, timeout: Optional[float] = None, priority: str = "interactive") -> Dict:
+        timeout = timeout or self.request_timeout
+        self._admit_request()
+        try:
+            self.upstream_scheduler.acquire(priority)
+        except UpstreamBudgetExhausted as e:
+            self.newsdata_breaker.release()
+            raise NewsDataBudgetError(str(e), 429, e.retry_after) from e
+        except BaseException:
+            self.newsdata_breaker.release()
+            raise
+
+        try:
+            data = self._send_request(params, timeout)
+        except NewsDataRequestError as e:
+            self._record_outcome(e)
+            raise
+        except Exception:
+            self.newsdata_breaker.record_failure()
+            raise
+        except BaseException:
+            # Interrupted before an outcome: hand back a half-open probe slot
+            self.newsdata_breaker.release()
+            raise
+        self._record_outcome(None)
+
+        data = self._check_api_status(data)
+        self.upstream_cache.put(params, data)
+        return data
+
+    def _send_request(self, params: Dict, timeout: float) -> Dict:
+        try:
+            response = self.http_session.get(self.base_url, params=params, timeout=timeout)
+            if response.status_code == 422:
+                fallback_params = params.copy()
+                fallback_params["size"] = self.max_page_size
+                response = self.http_session.get(self.base_url, params=fallback_params, timeout=timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            response = getattr(e, "response", None)
+            status_code = response.status_code if response is not None else None
+            if status_code == 429:
+                raise self._rate_limited_error(e, _parse_retry_after(response.headers.get("Retry-After"))) from e
+            raise NewsDataRequestError(str(e), status_code) from e
+        return self._decode_response(response)
+
+    async def _afetch_page(self, params: Dict, timeout: Optional[float] = None, priority: str = "interactive") -> Dict:
+        """GET one NewsData.io page over the pooled async client"""
+        # Both cache lookups may read the SQLite tier
+        cached = await get_executor("io").run(self.upstream_cache.get, params)
+        if cached is not None:
+            return cached
+
+        key = self.upstream_cache.build_key(params)
+        try:
+            return await self.upstream_flights.ado(key, lambda: self._arequest_page(params, timeout, priority))
+        except NewsDataRequestError as e:
+            return await get_executor("io").run(self._stale_or_raise, params, e)
+
+    async def _arequest_page(self, params: Dict, timeout: Optional[float] = None,
+                             priority: str = "interactive") -> Dict:
+        timeout = timeout or self.request_timeout
+        self._admit_request()
+        try:
+            await self.upstream_scheduler.aacquire(priority)
+        except UpstreamBudgetExhausted as e:
+            self.newsdata_breaker.release()
+            raise NewsDataBudgetError(str(e), 429, e.retry_after) from e
+        except BaseException:
+            # Cancelled while waiting for a token, e.g. by the feed deadline
+            self.newsdata_breaker.release()
+            raise
+
+        try:
+            data = await self._asend_request(params, timeout)
+        except NewsDataRequestError as e:
+            self._record_outcome(e)
+            raise
+        except Exception:
+            self.newsdata_breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled mid-request: no outcome, so hand back a half-open probe slot
+            self.newsdata_breaker.release()
+            raise
+        self._record_outcome(None)
+
+        data = self._check_api_status(data)
+        try:
+            await get_executor("io").run(self.upstream_cache.put, params, data)
+        except ExecutorOverloaded:
+            pass  # the response is still good, it just isn't cached
+        return data
+
+    async def _asend_request(self, params: Dict, timeout: float) -> Dict:
+        client = self._get_async_http()
+        try:
+            response = await client.get(self.base_url, params=params, timeout=timeout)
+            if response.status_code == 422:
+                fallback_params = params.copy()
+                fallback_params["size"] = self.max_page_size
+                response = await client.get(self.base_url, params=fallback_params, timeout=timeout)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            response = e.response if isinstance(e, httpx.HTTPStatusError) else None
+            status_code = response.status_code if response is not None else None
+            if status_code == 429:
+                raise self._rate_limited_error(e, _parse_retry_after(response.headers.get("Retry-After"))) from e
+            raise NewsDataRequestError(str(e), status_code) from e
+        return self._decode_response(response)
 
     def _normalize_text(self, value: str) -> str:
         cleaned = (value or "").lower().strip()
@@ -125,60 +532,109 @@ class NewsDataClient:
             return value
         return ""
     
-    def _calculate_similarity_score(self, query: str, title: str, description: str) -> float:
-        """Calculate similarity score using SBERT with enhanced matching"""
+    def _calculate_term_boosts(self, query: str, titles: List[str], descriptions: List[str]):
+        """Vectorized query-term boosts for a batch of titles and descriptions"""
+        query_lower = query.lower()
+        query_terms = query_lower.split()
+        titles_lower = [title.lower() for title in titles]
+        descs_lower = [description.lower() for description in descriptions]
+
+        # Term presence matrices, shape (terms, articles)
+        title_hits = np.array(
+            [[term in title for title in titles_lower] for term in query_terms], dtype=bool
+        ).reshape(len(query_terms), len(titles_lower))
+        desc_hits = np.array(
+            [[term in desc for desc in descs_lower] for term in query_terms], dtype=bool
+        ).reshape(len(query_terms), len(descs_lower))
+
+        title_boost = title_hits.sum(axis=0) * 0.2
+        desc_boost = desc_hits.sum(axis=0) * 0.1
+
+        # Additional boost for exact phrase matches
+        title_boost = title_boost + np.array([query_lower in title for title in titles_lower], dtype=bool) * 0.3
+        desc_boost = desc_boost + np.array([query_lower in desc for desc in descs_lower], dtype=bool) * 0.2
+
+        # Cap boosts
+        return np.minimum(title_boost, 0.5), np.minimum(desc_boost, 0.3)
+
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Encode a query, reusing cached embeddings for repeated queries"""
+        cached = self.query_embedding_cache.get(query)
+        if cached is not None:
+            return cached.reshape(1, -1)
+
+        query_embedding = self._get_model().encode([query])
+        self.query_embedding_cache.put(query, query_embedding[0])
+        return query_embedding
+
+    def _encode_articles(self, titles: List[str], descriptions: List[str]) -> np.ndarray:
+        """Encode article texts, reusing stored embeddings and encoding only misses"""
+        sbert_model = self._get_model()
+        article_texts = [f"{title} {description}" for title, description in zip(titles, descriptions)]
+        if not self.embedding_store:
+            return sbert_model.encode(article_texts, batch_size=self.encode_batch_size)
+
+        keys = [self._generate_content_hash(title, description) for title, description in zip(titles, descriptions)]
+        stored = self.embedding_store.get_many(keys)
+
+        missing = [index for index, key in enumerate(keys) if key not in stored]
+        if missing:
+            encoded = sbert_model.encode(
+                [article_texts[index] for index in missing],
+                batch_size=self.encode_batch_size,
+            )
+            missing_keys = [keys[index] for index in missing]
+            try:
+                self.embedding_store.put_many(missing_keys, encoded)
+            except Exception as e:
+                print(f"[embeddings] Failed to persist embeddings: {e}")
+            stored.update(zip(missing_keys, encoded))
+
+        return np.vstack([stored[key] for key in keys])
+
+    @staticmethod
+    def _cosine_similarity(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Pairwise cosine similarity between two row-vector matrices"""
+        left = np.asarray(left, dtype=np.float32)
+        right = np.asarray(right, dtype=np.float32)
+        left = left / np.clip(np.linalg.norm(left, axis=1, keepdims=True), 1e-12, None)
+        right = right / np.clip(np.linalg.norm(right, axis=1, keepdims=True), 1e-12, None)
+        return left @ right.T
+
+    def _calculate_similarity_scores(self, query: str, articles: List[Tuple[str, str]]) -> List[float]:
+        """Calculate SBERT similarity scores for a batch of (title, description) pairs"""
+        if not articles:
+            return []
+
         try:
-            title = title or ""
-            description = description or ""
+            titles = [title or "" for title, _ in articles]
+            descriptions = [description or "" for _, description in articles]
+
+            # Encode the query once and every uncached article in batched forward passes
+            query_embedding = self._encode_query(query)
+            article_embeddings = self._encode_articles(titles, descriptions)
 
-            # Combine title and description for better matching
-            article_text = f"{title} {description}"
-            
-            # Generate embeddings
-            query_embedding = self.sbert_model.encode([query])
-            article_embedding = self.sbert_model.encode([article_text])
-            
             # Calculate cosine similarity
-            similarity = cosine_similarity(query_embedding, article_embedding)[0][0]
-            
+            similarities = self._cosine_similarity(query_embedding, article_embeddings)[0]
+
             # Apply sigmoid-like transformation to amplify differences
-            amplified_similarity = 1 / (1 + np.exp(-10 * (similarity - 0.3)))
-            
+            amplified_similarities = 1 / (1 + np.exp(-10 * (similarities - 0.3)))
+
             # Boost score if query terms appear in title (strong signal)
-            query_lower = query.lower()
-            title_lower = title.lower()
-            desc_lower = description.lower()
-            
-            # Extract key terms from query
-            query_terms = query_lower.split()
-            title_boost = 0
-            desc_boost = 0
-            
-            for term in query_terms:
-                if term in title_lower:
-                    title_boost += 0.2
-                if term in desc_lower:
-                    desc_boost += 0.1
-            
-            # Additional boost for exact phrase matches
-            if query_lower in title_lower:
-                title_boost += 0.3
-            if query_lower in desc_lower:
-                desc_boost += 0.2
-            
-            # Cap boosts
-            title_boost = min(title_boost, 0.5)
-            desc_boost = min(desc_boost, 0.3)
-            
+            title_boost, desc_boost = self._calculate_term_boosts(query, titles, descriptions)
+
             # Combine scores
-            final_similarity = amplified_similarity + title_boost + desc_boost
-            
-            return max(0.0, min(1.0, float(final_similarity)))
-            
+            final_similarities = np.clip(amplified_similarities + title_boost + desc_boost, 0.0, 1.0)
+            return [float(score) for score in final_similarities]
+
         except Exception as e:
             print(f"Error calculating similarity: {e}")
-            return 0.1
-    
+            return [0.1] * len(articles)
+
+    def _calculate_similarity_score(self, query: str, title: str, description: str) -> float:
+        """Calculate similarity score using SBERT with enhanced matching"""
+        return self._calculate_similarity_scores(query, [(title, description)])[0]
+
     def _calculate_recency_score(self, published_at: str) -> float:
         """Calculate recency score from ISO date string"""
         try:
@@ -216,25 +672,21 @@ class NewsDataClient:
         content = f"{title} {description}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    def _is_duplicate(self, article: Dict) -> bool:
+    def _dedupe_keys(self, article: Dict) -> List[str]:
+        """URL, title and content keys for an article, raw (``link``) or processed (``url``)"""
+        url = article.get('url') or article.get('link') or ''
+        title = article.get('title') or ''
+        content_hash = self._generate_content_hash(title, article.get('description') or '')
+
+        return [f"url:{url}" if url else "", f"title:{title.lower()}" if title else "", f"hash:{content_hash}"]
+
+    def _is_duplicate(self, article: Dict, view: DedupeView) -> bool:
         """Check if article is duplicate"""
-        url = article.get('url', '')
-        title = article.get('title', '')
-        content_hash = self._generate_content_hash(title, article.get('description', ''))
-        
-        return (url in self.seen_urls or 
-                title.lower() in self.seen_titles or 
-                content_hash in self.seen_content_hashes)
+        return view.is_duplicate(self._dedupe_keys(article))
     
-    def _add_to_seen(self, article: Dict):
-        """Add article to seen sets"""
-        url = article.get('url', '')
-        title = article.get('title', '')
-        content_hash = self._generate_content_hash(title, article.get('description', ''))
-        
-        self.seen_urls.add(url)
-        self.seen_titles.add(title.lower())
-        self.seen_content_hashes.add(content_hash)
+    def _add_to_seen(self, article: Dict, view: DedupeView):
+        """Record article as seen in this request and in the shared filter"""
+        view.add(self._dedupe_keys(article))
     
     def _categorize_article_with_llm(self, title: str, description: str, query: str) -> str:
         """
@@ -268,167 +720,497 @@ class NewsDataClient:
         
         return 'general'
     
-    def search_news(self, query: str, category: Optional[str] = None, country: Optional[str] = None, language: str = "en", 
-                   page_size: int = 20, page: int = 1, interests: Optional[List[str]] = None,
-                   per_page: int = 12) -> Dict:
+    def _search_dedupe_keys(self, url: str, title: str, description: str) -> List[str]:
+        return [f"url:{url}", f"sig:{self._article_signature(title, description)}"]
+
+    def _session_dedupe_view(self, session: Dict) -> DedupeView:
         """
-        Search news using NewsData.io API with LLM categorization and relevance scoring
+        Dedupe view for a search session. The shared filter is worker-local, so a
+        session started on another worker (or outlived by a filter rotation) is
+        reseeded from the articles it has already returned.
         """
-        # Build API request
-        resolved_category = self._normalize_category(category)
-        if not resolved_category:
-            resolved_category = self._resolve_category_from_interests(query, interests)
+        dedupe = DedupeView(self.article_dedupe, namespace=session.setdefault("dedupe_id", uuid.uuid4().hex))
+        served = session["articles"]
+        if served and not dedupe.is_duplicate(
+            self._search_dedupe_keys(served[-1]["url"], served[-1]["title"], served[-1]["description"])
+        ):
+            for article in served:
+                dedupe.add(self._search_dedupe_keys(article["url"], article["title"], article["description"]))
+        return dedupe
+
+    def _process_search_page(self, dedupe: DedupeView, articles: List[Dict], query: str,
+                             resolved_category: Optional[str]) -> List[Dict]:
+        """Dedupe one upstream page against the session's view and score it in a single batch"""
+        candidates = []
+        for article in articles:
+            title = article.get("title", "")
+            description = article.get("description") or ""
+            url = article.get("link", "")
 
+            if not title or not url:
+                continue
+
+            keys = self._search_dedupe_keys(url, title, description)
+            if dedupe.is_duplicate(keys):
+                continue
+            dedupe.add(keys)
+            candidates.append(article)
+
+        similarity_scores = self._calculate_similarity_scores(
+            query,
+            [(article.get("title", ""), article.get("description") or "") for article in candidates],
+        )
+
+        processed_articles = []
+        for article, similarity_score in zip(candidates, similarity_scores):
+            title = article.get("title", "")
+            description = article.get("description") or ""
+            published_at = article.get("pubDate", "")
+
+            llm_category = resolved_category or self._categorize_article_with_llm(title, description, query)
+            if isinstance(llm_category, dict):
+                llm_category = llm_category.get("category", "general")
+
+            recency_score = self._calculate_recency_score(published_at)
+            final_score = self._calculate_final_score(similarity_score, recency_score)
+
+            processed_articles.append({
+                "title": title,
+                "description": description,
+                "url": article.get("link", ""),
+                "publishedAt": published_at,
+                "source": article.get("source_id", ""),
+                "category": llm_category,
+                "similarity_score": similarity_score,
+                "recency_score": recency_score,
+                "final_score": final_score,
+                "api_category": article.get("category", ""),
+                "keywords": article.get("keywords", []),
+                "creator": article.get("creator", []),
+                "image_url": article.get("image_url", "")
+            })
+
+        return processed_articles
+
+    def _prepare_search(self, query: str, resolved_category: Optional[str], country: Optional[str], language: str,
+                        page_size: int, page: int, interests: Optional[List[str]], per_page: int,
+                        priority: str) -> Dict:
+        """Resolve paging parameters and the pagination session for a search"""
         per_page = max(1, int(per_page))
         page = max(1, int(page))
         request_size = max(1, min(int(page_size), self.max_page_size))
         resolved_country = self._normalize_country(country)
         search_key = self._build_search_key(query, language, resolved_category, interests) + f"|country:{resolved_country}"
 
-        if page == 1 or search_key not in self.search_sessions:
-            self.search_sessions[search_key] = {
+        session = self.search_sessions.get(search_key) if page > 1 else None
+        if session is None:
+            session = {
                 "articles": [],
-                "seen_urls": set(),
-                "seen_signatures": set(),
+                # Articles already returned are remembered in the shared dedupe filter under this id
+                "dedupe_id": uuid.uuid4().hex,
+                "pending_pages": [],
                 "next_page": None,
-                "exhausted": False,
+                "fetch_done": False,
             }
 
-        session = self.search_sessions[search_key]
-        
         print(f"[search] Searching NewsData.io for: '{query}'")
         if resolved_category:
             print(f"[search] Category: {resolved_category}")
-        
+
+        return {
+            "query": query,
+            "language": language,
+            "resolved_category": resolved_category,
+            "resolved_country": resolved_country,
+            "request_size": request_size,
+            "page": page,
+            "per_page": per_page,
+            "priority": priority,
+            "session_key": search_key,
+            "session": session,
+            "dedupe": self._session_dedupe_view(session),
+        }
+
+    def _build_search_params(self, search: Dict) -> Dict:
+        params = {
+            "apikey": self.api_key,
+            "q": search["query"],
+            "language": search["language"],
+            "size": search["request_size"],
+        }
+
+        if search["resolved_country"]:
+            params["country"] = search["resolved_country"]
+
+        if search["session"]["next_page"]:
+            params["page"] = search["session"]["next_page"]
+
+        return params
+
+    def _is_session_exhausted(self, session: Dict) -> bool:
+        return session["fetch_done"] and not session["pending_pages"]
+
+    def _needs_more_articles(self, search: Dict) -> bool:
+        session = search["session"]
+        target_count = search["page"] * search["per_page"]
+        return len(session["articles"]) < target_count and not self._is_session_exhausted(session)
+
+    def _record_search_page(self, session: Dict, data: Dict) -> None:
+        """Queue a fetched upstream page for scoring and advance the page token"""
+        articles = data.get("results", [])
+        print(f"[search] Found {len(articles)} raw articles from API")
+
+        if articles:
+            session["pending_pages"].append(articles)
+
+        if data.get("stale"):
+            session["served_stale"] = True
+        session["next_page"] = data.get("nextPage")
+        if not articles or not session["next_page"]:
+            session["fetch_done"] = True
+
+    def _score_search_page(self, search: Dict, articles: List[Dict]) -> None:
+        scored = self._process_search_page(search["dedupe"], articles, search["query"], search["resolved_category"])
+        search["session"]["articles"].extend(scored)
+        self._index_articles(scored, search["language"], search["resolved_country"])
+
+    def _index_articles(self, articles: List[Dict], language: str, country: str) -> None:
+        if not articles:
+            return
+        if self.article_index is not None:
+            self.article_index.add_many(articles, language, country)
+        if self.ann_index is not None:
+            try:
+                self._ann_executor.submit(self._add_to_ann_index, list(articles), language, country)
+            except RuntimeError:
+                pass  # executor already shut down
+
+    def _add_to_ann_index(self, articles: List[Dict], language: str, country: str) -> None:
+        """Embed articles (mostly embedding store hits) and insert them into the ANN index"""
         try:
-            target_count = page * per_page
-
-            while len(session["articles"]) < target_count and not session["exhausted"]:
-                params = {
-                    "apikey": self.api_key,
-                    "q": query,
-                    "language": language,
-                    "size": request_size,
-                }
+            vectors = self._encode_articles(
+                [article.get("title") or "" for article in articles],
+                [article.get("description") or "" for article in articles],
+            )
+            self.ann_index.add(
+                [article["url"] for article in articles],
+                vectors,
+                [dict(article, language=language, country=country) for article in articles],
+            )
+        except Exception as e:
+            print(f"[ann] Failed to index article embeddings: {e}")
+            return
 
-                if resolved_country:
-                    params["country"] = resolved_country
-
-                if session["next_page"]:
-                    params["page"] = session["next_page"]
-
-                response = requests.get(self.base_url, params=params, timeout=30)
-                if response.status_code == 422:
-                    fallback_params = params.copy()
-                    fallback_params["size"] = self.max_page_size
-                    response = requests.get(self.base_url, params=fallback_params, timeout=30)
-                response.raise_for_status()
-
-                data = response.json()
-
-                if data.get("status") != "success":
-                    raise Exception(f"API Error: {data.get('results', {}).get('message', 'Unknown error')}")
-
-                articles = data.get("results", [])
-                print(f"[search] Found {len(articles)} raw articles from API")
-
-                if not articles:
-                    session["exhausted"] = True
-                    break
-
-                for article in articles:
-                    title = article.get("title", "")
-                    description = article.get("description") or ""
-                    url = article.get("link", "")
-                    published_at = article.get("pubDate", "")
-                    source = article.get("source_id", "")
-                    signature = self._article_signature(title, description)
-
-                    if not title or not url:
-                        continue
-
-                    if url in session["seen_urls"] or signature in session["seen_signatures"]:
-                        continue
-                    session["seen_urls"].add(url)
-                    session["seen_signatures"].add(signature)
-
-                    llm_category = resolved_category or self._categorize_article_with_llm(title, description, query)
-                    if isinstance(llm_category, dict):
-                        llm_category = llm_category.get("category", "general")
-
-                    similarity_score = self._calculate_similarity_score(query, title, description)
-                    recency_score = self._calculate_recency_score(published_at)
-                    final_score = self._calculate_final_score(similarity_score, recency_score)
-
-                    processed_article = {
-                        "title": title,
-                        "description": description,
-                        "url": url,
-                        "publishedAt": published_at,
-                        "source": source,
-                        "category": llm_category,
-                        "similarity_score": similarity_score,
-                        "recency_score": recency_score,
-                        "final_score": final_score,
-                        "api_category": article.get("category", ""),
-                        "keywords": article.get("keywords", []),
-                        "creator": article.get("creator", []),
-                        "image_url": article.get("image_url", "")
-                    }
-
-                    session["articles"].append(processed_article)
-
-                session["next_page"] = data.get("nextPage")
-                if not session["next_page"]:
-                    session["exhausted"] = True
-
-            start_idx = (page - 1) * per_page
-            end_idx = start_idx + per_page
-            paged_articles = session["articles"][start_idx:end_idx]
-
-            category_counts = {}
-            for article in session["articles"]:
-                cat = article["category"]
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-
-            has_more = len(session["articles"]) > end_idx or not session["exhausted"]
-
-            print(f"[search] Processed {len(session['articles'])} cumulative relevant articles")
+        if time.monotonic() - self._ann_saved_at >= self.ann_snapshot_interval:
+            self._save_ann_index()
 
-            return {
-                "status": "success",
-                "total": len(session["articles"]),
-                "articles": paged_articles,
-                "query": query,
-                "resolved_category": resolved_category,
-                "country": resolved_country,
-                "category_distribution": category_counts,
-                "page": page,
-                "per_page": per_page,
-                "has_more": has_more,
-            }
-            
-        except requests.exceptions.RequestException as e:
-            print(f"[error] API request failed: {e}")
+    def _semantic_search(self, query: str, language: str, country: str, limit: int) -> List[Dict]:
+        """Nearest indexed articles to the query embedding; empty until the model is ready"""
+        if self.ann_index is None or not self.is_model_ready():
+            return []
+
+        def accept(article: Dict) -> bool:
+            return (not language or article.get("language") == language) and \
+                (not country or article.get("country") == country)
+
+        hits = self.ann_index.search(self._encode_query(query)[0], k=limit, accept=accept)
+        return [
+            dict(article, semantic_score=round(score, 4))
+            for score, article in hits if score >= self.ann_min_similarity
+        ]
+
+    def _local_search(self, search: Dict) -> List[Dict]:
+        """
+        Keyword (BM25) and semantic (ANN) hits from the local indexes, merged by
+        reciprocal rank fusion, one past the requested page so has_more is known
+        """
+        if self.local_search_mode == "off":
+            return []
+
+        limit = search["page"] * search["per_page"] + 1
+        ranked_lists = [
+            self.article_index.search(search["query"], search["language"], search["resolved_country"], limit=limit)
+            if self.article_index is not None else [],
+            self._semantic_search(search["query"], search["language"], search["resolved_country"], limit),
+        ]
+
+        fused: Dict[str, float] = {}
+        articles: Dict[str, Dict] = {}
+        for hits in ranked_lists:
+            for rank, article in enumerate(hits):
+                url = article["url"]
+                fused[url] = fused.get(url, 0.0) + 1.0 / (60 + rank)
+                articles[url] = dict(articles.get(url, {}), **article)
+
+        ordered = sorted(fused, key=fused.get, reverse=True)[:limit]
+        return [articles[url] for url in ordered]
+
+    def _build_local_search_result(self, search: Dict, hits: List[Dict], upstream_error: Optional[str] = None) -> Dict:
+        start_idx = (search["page"] - 1) * search["per_page"]
+        end_idx = start_idx + search["per_page"]
+
+        category_counts = {}
+        for article in hits:
+            cat = article.get("category", "general")
+            category_counts[cat] = category_counts.get(cat, 0) + 1
+
+        print(f"[search] Served {len(hits)} articles from the local index")
+        result = {
+            "status": "success",
+            "total": len(hits),
+            "articles": hits[start_idx:end_idx],
+            "query": search["query"],
+            "resolved_category": search["resolved_category"],
+            "country": search["resolved_country"],
+            "category_distribution": category_counts,
+            "page": search["page"],
+            "per_page": search["per_page"],
+            "has_more": len(hits) > end_idx,
+            "served_from": "local_index",
+        }
+        if upstream_error:
+            result["upstream_error"] = upstream_error
+        return result
+
+    def _serve_local_first(self, search: Dict) -> Optional[Dict]:
+        """In "first" mode, answer from the index when it alone covers the requested page"""
+        if self.local_search_mode != "first":
+            return None
+        hits = self._local_search(search)
+        if len(hits) >= search["page"] * search["per_page"]:
+            return self._build_local_search_result(search, hits)
+        return None
+
+    def _merge_local_hits(self, search: Dict, result: Dict) -> Dict:
+        """Top up a short last page of live results with indexed articles not already shown"""
+        if self.local_search_mode != "first" or result["has_more"] or len(result["articles"]) >= search["per_page"]:
+            return result
+
+        shown = {article["url"] for article in search["session"]["articles"]}
+        extra = [hit for hit in self._local_search(search) if hit["url"] not in shown]
+        if extra:
+            for article in extra:
+                article["served_from"] = "local_index"
+            result["articles"] = result["articles"] + extra[:search["per_page"] - len(result["articles"])]
+        return result
+
+    def _finish_search(self, search: Dict) -> Dict:
+        return self._merge_local_hits(search, self._build_search_result(search))
+
+    def _search_failed(self, search: Dict, error: Exception) -> Dict:
+        """Error result, or local index results when upstream is unavailable"""
+        result = self._search_error(error)
+        if isinstance(error, NewsDataRequestError) and _is_upstream_failure(error.status_code):
+            hits = self._local_search(search)
+            if hits:
+                return self._build_local_search_result(search, hits, upstream_error=result["message"])
+        return result
+
+    def _should_prefetch(self, session: Dict, in_flight, scoring_page) -> bool:
+        if in_flight is not None or session["fetch_done"]:
+            return False
+        # Always fetch when there is nothing to score, otherwise stay within the lookahead
+        if scoring_page is None:
+            return True
+        # The client may never ask for a lookahead page, so only spend tokens background work could spend
+        return len(session["pending_pages"]) < self.pipeline_lookahead and \
+            self.upstream_scheduler.has_spare("background")
+
+    def _fill_search(self, search: Dict) -> None:
+        """Fetch and score pages until the requested page is covered, prefetching while scoring"""
+        session = search["session"]
+        in_flight: Optional[concurrent.futures.Future] = None
+        try:
+            while self._needs_more_articles(search):
+                if in_flight is not None and in_flight.done():
+                    self._record_search_page(session, in_flight.result())
+                    in_flight = None
+
+                scoring_page = session["pending_pages"].pop(0) if session["pending_pages"] else None
+                if self._should_prefetch(session, in_flight, scoring_page):
+                    in_flight = self._prefetch_executor.submit(
+                        self._fetch_page, self._build_search_params(search), priority=search["priority"]
+                    )
+
+                if scoring_page is not None:
+                    self._score_search_page(search, scoring_page)
+                elif in_flight is not None:
+                    self._record_search_page(session, in_flight.result())
+                    in_flight = None
+        finally:
+            if in_flight is not None:
+                # Keep a completed lookahead page for the next call on this session
+                if in_flight.done() and in_flight.exception() is None:
+                    self._record_search_page(session, in_flight.result())
+                else:
+                    in_flight.cancel()
+
+    async def _afill_search(self, search: Dict) -> None:
+        """Async variant of _fill_search: scoring runs on the CPU pool while the next page is fetched"""
+        session = search["session"]
+        in_flight: Optional[asyncio.Task] = None
+        try:
+            while self._needs_more_articles(search):
+                if in_flight is not None and in_flight.done():
+                    self._record_search_page(session, in_flight.result())
+                    in_flight = None
+
+                scoring_page = session["pending_pages"].pop(0) if session["pending_pages"] else None
+                if self._should_prefetch(session, in_flight, scoring_page):
+                    in_flight = asyncio.create_task(
+                        self._afetch_page(self._build_search_params(search), priority=search["priority"])
+                    )
+
+                if scoring_page is not None:
+                    await get_executor("cpu").run(self._score_search_page, search, scoring_page)
+                elif in_flight is not None:
+                    self._record_search_page(session, await in_flight)
+                    in_flight = None
+        finally:
+            if in_flight is not None:
+                # Keep a completed lookahead page for the next call on this session
+                if in_flight.done() and not in_flight.cancelled() and in_flight.exception() is None:
+                    self._record_search_page(session, in_flight.result())
+                else:
+                    in_flight.cancel()
+
+    def _build_search_result(self, search: Dict) -> Dict:
+        session = search["session"]
+        page = search["page"]
+        per_page = search["per_page"]
+
+        start_idx = (page - 1) * per_page
+        end_idx = start_idx + per_page
+        paged_articles = session["articles"][start_idx:end_idx]
+
+        category_counts = {}
+        for article in session["articles"]:
+            cat = article["category"]
+            category_counts[cat] = category_counts.get(cat, 0) + 1
+
+        has_more = len(session["articles"]) > end_idx or not self._is_session_exhausted(session)
+
+        print(f"[search] Processed {len(session['articles'])} cumulative relevant articles")
+
+        return {
+            "status": "success",
+            "total": len(session["articles"]),
+            "articles": paged_articles,
+            "query": search["query"],
+            "resolved_category": search["resolved_category"],
+            "country": search["resolved_country"],
+            "category_distribution": category_counts,
+            "page": page,
+            "per_page": per_page,
+            "has_more": has_more,
+            "stale": session.get("served_stale", False),
+        }
+
+    def _overloaded_error(self, error: ExecutorOverloaded) -> Dict:
+        print(f"[error] {error}")
+        return {
+            "status": "error",
+            "message": f"Server busy: {error}",
+            "articles": [],
+            "overloaded": True,
+            "retry_after": error.retry_after,
+        }
+
+    def _search_error(self, error: Exception) -> Dict:
+        if isinstance(error, ExecutorOverloaded):
+            return self._overloaded_error(error)
+        if isinstance(error, NewsDataRequestError):
+            print(f"[error] API request failed: {error}")
             return {
                 "status": "error",
-                "message": f"API request failed: {str(e)}",
-                "articles": []
+                "message": f"API request failed: {str(error)}",
+                "articles": [],
+                "status_code": error.status_code,
+                "rate_limited": error.status_code == 429,
+                "circuit_open": isinstance(error, NewsDataCircuitOpenError),
+                "budget_exhausted": isinstance(error, NewsDataBudgetError),
+                "retry_after": error.retry_after,
             }
+
+        print(f"[error] Error processing news: {error}")
+        return {
+            "status": "error",
+            "message": f"Processing error: {str(error)}",
+            "articles": []
+        }
+
+    def search_news(self, query: str, category: Optional[str] = None, country: Optional[str] = None, language: str = "en", 
+                   page_size: int = 20, page: int = 1, interests: Optional[List[str]] = None,
+                   per_page: int = 12, priority: str = "interactive") -> Dict:
+        """
+        Search news using NewsData.io API with LLM categorization and relevance scoring
+        """
+        # Build API request
+        resolved_category = self._normalize_category(category)
+        if not resolved_category:
+            resolved_category = self._resolve_category_from_interests(query, interests)
+
+        search = self._prepare_search(query, resolved_category, country, language, page_size, page, interests,
+                                      per_page, priority)
+
+        local_result = self._serve_local_first(search)
+        if local_result is not None:
+            return local_result
+
+        try:
+            self._fill_search(search)
+            return self._finish_search(search)
+
         except Exception as e:
-            print(f"[error] Error processing news: {e}")
-            return {
-                "status": "error", 
-                "message": f"Processing error: {str(e)}",
-                "articles": []
-            }
-    
-    def get_top_headlines(self, category: Optional[str] = None, country: Optional[str] = None, language: str = "en", 
-                         page_size: int = 20, page: int = 1) -> Dict:
-        """Get top headlines from NewsData.io"""
-        # Clear cache for fresh headlines
-        self.clear_cache()
-        
+            return self._search_failed(search, e)
+        finally:
+            self.search_sessions.put(search["session_key"], search["session"])
+
+    async def asearch_news(self, query: str, category: Optional[str] = None, country: Optional[str] = None,
+                           language: str = "en", page_size: int = 20, page: int = 1,
+                           interests: Optional[List[str]] = None, per_page: int = 12,
+                           priority: str = "interactive") -> Dict:
+        """
+        Async variant of search_news using the pooled HTTP client
+        """
+        resolved_category = self._normalize_category(category)
+        if not resolved_category:
+            # May call OpenAI, so keep it off the event loop
+            try:
+                resolved_category = await get_executor("io").run(
+                    self._resolve_category_from_interests, query, interests
+                )
+            except ExecutorOverloaded as e:
+                return self._overloaded_error(e)
+
+        try:
+            # Session lookup reads SQLite or Redis; local search encodes the query and queries FTS5
+            search = await get_executor("io").run(
+                self._prepare_search, query, resolved_category, country, language, page_size, page, interests,
+                per_page, priority
+            )
+            local_result = await get_executor("cpu").run(self._serve_local_first, search)
+        except ExecutorOverloaded as e:
+            return self._overloaded_error(e)
+        if local_result is not None:
+            return local_result
+
+        try:
+            await self._afill_search(search)
+            return await get_executor("cpu").run(self._finish_search, search)
+
+        except Exception as e:
+            try:
+                return await get_executor("cpu").run(self._search_failed, search, e)
+            except ExecutorOverloaded as overloaded:
+                return self._overloaded_error(overloaded)
+        finally:
+            try:
+                await get_executor("io").run(self.search_sessions.put, search["session_key"], search["session"])
+            except ExecutorOverloaded as e:
+                print(f"[search] Search session not saved: {e}")
+
+    def _build_headline_params(self, country: Optional[str], language: str, page_size: int) -> Dict:
         request_size = max(1, min(int(page_size), self.max_page_size))
 
         # Build API request for latest news
@@ -440,88 +1222,152 @@ class NewsDataClient:
         resolved_country = self._normalize_country(country)
         if resolved_country:
             params["country"] = resolved_country
-        
+
         print(f"[headlines] Getting top headlines")
-        
+        return params
+
+    def _process_headlines(self, data: Dict, params: Dict) -> Dict:
+        articles = data.get("results", [])
+        dedupe = DedupeView(self.article_dedupe)
+        print(f"[headlines] Found {len(articles)} headlines")
+
+        # Process headlines with recency scoring only
+        processed_articles = []
+        for article in articles:
+            if not self._is_duplicate(article, dedupe):
+                title = article.get("title", "")
+                description = article.get("description") or ""
+                url = article.get("link", "")
+                published_at = article.get("pubDate", "")
+                source = article.get("source_id", "")
+
+                if not title or not url:
+                    continue
+
+                # LLM categorization
+                llm_category = self._categorize_article_with_llm(title, description, "")
+                if isinstance(llm_category, dict):
+                    llm_category = llm_category.get("category", "general")
+
+                # Only recency scoring for headlines
+                recency_score = self._calculate_recency_score(published_at)
+
+                processed_article = {
+                    "title": title,
+                    "description": description,
+                    "url": url,
+                    "publishedAt": published_at,
+                    "source": source,
+                    "category": llm_category,
+                    "similarity_score": 0.0,
+                    "recency_score": recency_score,
+                    "final_score": recency_score,
+                    "api_category": article.get("category", ""),
+                    "keywords": article.get("keywords", []),
+                    "creator": article.get("creator", []),
+                    "image_url": article.get("image_url", "")
+                }
+
+                processed_articles.append(processed_article)
+                self._add_to_seen(processed_article, dedupe)
+
+        # Sort by recency (descending)
+        processed_articles.sort(key=lambda x: x["final_score"], reverse=True)
+        self._index_articles(processed_articles, params.get("language", ""), params.get("country", ""))
+
+        return {
+            "status": "success",
+            "total": len(processed_articles),
+            "articles": processed_articles,
+            "stale": bool(data.get("stale")),
+        }
+
+    def _headlines_error(self, error: Exception) -> Dict:
+        if isinstance(error, ExecutorOverloaded):
+            return self._overloaded_error(error)
+        print(f"[error] Error getting headlines: {error}")
+        status_code = error.status_code if isinstance(error, NewsDataRequestError) else None
+        return {
+            "status": "error",
+            "message": f"Error: {str(error)}",
+            "articles": [],
+            "status_code": status_code,
+            "rate_limited": status_code == 429,
+            "circuit_open": isinstance(error, NewsDataCircuitOpenError),
+            "budget_exhausted": isinstance(error, NewsDataBudgetError),
+            "retry_after": error.retry_after if isinstance(error, NewsDataRequestError) else None,
+        }
+
+    def get_top_headlines(self, category: Optional[str] = None, country: Optional[str] = None, language: str = "en", 
+                         page_size: int = 20, page: int = 1, priority: str = "headlines") -> Dict:
+        """Get top headlines from NewsData.io"""
+        params = self._build_headline_params(country, language, page_size)
+
         try:
-            response = requests.get(self.base_url, params=params, timeout=30)
-            if response.status_code == 422:
-                fallback_params = params.copy()
-                fallback_params["size"] = self.max_page_size
-                response = requests.get(self.base_url, params=fallback_params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get("status") != "success":
-                raise Exception(f"API Error: {data.get('results', {}).get('message', 'Unknown error')}")
-            
-            articles = data.get("results", [])
-            print(f"[headlines] Found {len(articles)} headlines")
-            
-            # Process headlines with recency scoring only
-            processed_articles = []
-            for article in articles:
-                if not self._is_duplicate(article):
-                    title = article.get("title", "")
-                    description = article.get("description") or ""
-                    url = article.get("link", "")
-                    published_at = article.get("pubDate", "")
-                    source = article.get("source_id", "")
-                    
-                    if not title or not url:
-                        continue
-                    
-                    # LLM categorization
-                    llm_category = self._categorize_article_with_llm(title, description, "")
-                    if isinstance(llm_category, dict):
-                        llm_category = llm_category.get("category", "general")
-                    
-                    # Only recency scoring for headlines
-                    recency_score = self._calculate_recency_score(published_at)
-                    
-                    processed_article = {
-                        "title": title,
-                        "description": description,
-                        "url": url,
-                        "publishedAt": published_at,
-                        "source": source,
-                        "category": llm_category,
-                        "similarity_score": 0.0,
-                        "recency_score": recency_score,
-                        "final_score": recency_score,
-                        "api_category": article.get("category", ""),
-                        "keywords": article.get("keywords", []),
-                        "creator": article.get("creator", []),
-                        "image_url": article.get("image_url", "")
-                    }
-                    
-                    processed_articles.append(processed_article)
-                    self._add_to_seen(processed_article)
-            
-            # Sort by recency (descending)
-            processed_articles.sort(key=lambda x: x["final_score"], reverse=True)
-            
-            return {
-                "status": "success",
-                "total": len(processed_articles),
-                "articles": processed_articles
-            }
-            
+            return self._process_headlines(self._fetch_page(params, priority=priority), params)
         except Exception as e:
-            print(f"[error] Error getting headlines: {e}")
-            return {
-                "status": "error",
-                "message": f"Error: {str(e)}",
-                "articles": []
-            }
-    
+            return self._headlines_error(e)
+
+    async def aget_top_headlines(self, category: Optional[str] = None, country: Optional[str] = None,
+                                 language: str = "en", page_size: int = 20, page: int = 1,
+                                 priority: str = "headlines") -> Dict:
+        """Async variant of get_top_headlines using the pooled HTTP client"""
+        params = self._build_headline_params(country, language, page_size)
+
+        try:
+            data = await self._afetch_page(params, priority=priority)
+            # Keyword categorization, dedupe and local indexing (SQLite) per headline
+            return await get_executor("io").run(self._process_headlines, data, params)
+        except Exception as e:
+            return self._headlines_error(e)
+
+    def get_query_cache_stats(self) -> Dict:
+        """Get hit/miss statistics for the query embedding cache"""
+        return self.query_embedding_cache.stats()
+
+    def get_upstream_cache_stats(self) -> Dict:
+        """Get hit/miss statistics for the raw NewsData response cache"""
+        return self.upstream_cache.stats()
+
+    def get_circuit_stats(self) -> Dict:
+        """Get circuit breaker state for NewsData and OpenAI"""
+        circuits = {"newsdata": self.newsdata_breaker.stats()}
+        if self.llm_categorizer:
+            circuits["openai"] = self.llm_categorizer.breaker.stats()
+        return circuits
+
+    def get_article_index_stats(self) -> Dict:
+        """Get size and hit counts of the local article index"""
+        if self.article_index is None:
+            return {"enabled": False}
+        return dict(self.article_index.stats(), mode=self.local_search_mode)
+
+    def get_ann_index_stats(self) -> Dict:
+        """Get size and training state of the semantic article index"""
+        if self.ann_index is None:
+            return {"enabled": False}
+        return self.ann_index.stats()
+
+    def get_dedupe_stats(self) -> Dict:
+        """Get size and rotation state of the shared dedupe filter"""
+        return self.article_dedupe.stats()
+
+    def get_search_session_stats(self) -> Dict:
+        """Get search session store size and eviction counts"""
+        return self.search_sessions.stats()
+
+    def get_scheduler_stats(self) -> Dict:
+        """Get token bucket state and per-priority grant/reject counts"""
+        return self.upstream_scheduler.stats()
+
+    def get_coalescing_stats(self) -> Dict:
+        """Get counts of executed and coalesced upstream requests"""
+        return self.upstream_flights.stats()
+
     def get_categories(self) -> List[str]:
         """Get available categories"""
         return self.categories.copy()
     
     def clear_cache(self):
         """Clear deduplication cache"""
-        self.seen_urls.clear()
-        self.seen_titles.clear()
-        self.seen_content_hashes.clear()
+        self.article_dedupe.clear()
@@ -0,0 +1,323 @@
+"""
+Search pagination session stores.
+
+``SEARCH_SESSION_BACKEND`` picks where sessions live:
+
+- ``local`` (default): in this worker's memory, so later pages must hit the same worker
+- ``sqlite``: a SQLite file shared by every worker on the box (``SEARCH_SESSION_DB``)
+- ``redis``: any Redis-protocol server (``SEARCH_SESSION_REDIS_URL``), shared across boxes
+
+The shared backends store sessions as JSON, so any worker can continue a
+session from its ``next_page`` token and the articles already scored.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+def estimate_session_bytes(session: Dict) -> int:
+    """Approximate memory held by a search session: its articles and queued pages"""
+    size = sys.getsizeof(session)
+    for article in session.get("articles", []):
+        size += sys.getsizeof(article) + sum(sys.getsizeof(value) for value in article.values())
+    for page in session.get("pending_pages", []):
+        for article in page:
+            size += sys.getsizeof(article) + sum(sys.getsizeof(value) for value in article.values())
+    return size
+
+
+def copy_session(session: Dict) -> Dict:
+    """Copy whose article and page lists a search can extend and pop without touching the stored session"""
+    return dict(session, articles=list(session.get("articles", [])), pending_pages=list(session.get("pending_pages", [])))
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "item"):
+        # numpy scalars from scoring
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def serialize_session(session: Dict) -> str:
+    return json.dumps(session, default=_json_default, separators=(",", ":"))
+
+
+def deserialize_session(body: str) -> Dict:
+    return json.loads(body)
+
+
+class SearchSessionStore:
+    """
+    Bounded store of search pagination sessions.
+
+    Sessions are evicted least-recently-used first once there are more than
+    ``max_sessions`` of them or their estimated size exceeds ``max_bytes``,
+    and are dropped when unused for ``idle_ttl_seconds``. Sizes are
+    re-estimated whenever a session is saved after a search. ``get`` returns
+    a copy, so concurrent searches on one session never share lists and
+    ``put`` is the only write path, as with the shared backends.
+    """
+
+    def __init__(self, max_sessions: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 idle_ttl_seconds: float = 900.0):
+        self.max_sessions = max(1, int(max_sessions))
+        self.max_bytes = max(1, int(max_bytes))
+        self.idle_ttl_seconds = max(0.0, float(idle_ttl_seconds))
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"lru": 0, "idle": 0, "bytes": 0}
+
+    def _drop(self, key: str) -> None:
+        _, size, _ = self._sessions.pop(key)
+        self._bytes -= size
+
+    def _evict(self, now: float) -> None:
+        if self.idle_ttl_seconds > 0:
+            while self._sessions:
+                key, (_, _, last_used) = next(iter(self._sessions.items()))
+                if now - last_used <= self.idle_ttl_seconds:
+                    break
+                self._drop(key)
+                self.evictions["idle"] += 1
+
+        while len(self._sessions) > self.max_sessions:
+            self._drop(next(iter(self._sessions)))
+            self.evictions["lru"] += 1
+
+        # Always keep the most recent session, even when it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._sessions) > 1:
+            self._drop(next(iter(self._sessions)))
+            self.evictions["bytes"] += 1
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            entry = self._sessions.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            session, size, _ = entry
+            self._sessions[key] = (session, size, now)
+            self._sessions.move_to_end(key)
+            self.hits += 1
+            return copy_session(session)
+
+    def put(self, key: str, session: Dict) -> None:
+        size = estimate_session_bytes(session)
+        with self._lock:
+            if key in self._sessions:
+                self._drop(key)
+            self._sessions[key] = (session, size, time.monotonic())
+            self._bytes += size
+            self._evict(time.monotonic())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "backend": "local",
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "idle_ttl_seconds": self.idle_ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": dict(self.evictions),
+            }
+
+
+class SqliteSearchSessionStore:
+    """
+    Search sessions in a SQLite file shared by all workers on the box.
+
+    Applies the same count, byte (serialized size) and idle TTL limits as
+    the local store, evicting the least recently used sessions first.
+    """
+
+    def __init__(self, db_path: str, max_sessions: int = 1000, max_bytes: int = 64 * 1024 * 1024,
+                 idle_ttl_seconds: float = 900.0):
+        self.db_path = db_path
+        self.max_sessions = max(1, int(max_sessions))
+        self.max_bytes = max(1, int(max_bytes))
+        self.idle_ttl_seconds = max(0.0, float(idle_ttl_seconds))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"lru": 0, "idle": 0, "bytes": 0}
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS search_sessions ("
+            "key TEXT PRIMARY KEY, last_used REAL NOT NULL, size INTEGER NOT NULL, body TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS search_sessions_last_used ON search_sessions (last_used)")
+        self._db.commit()
+
+    def _evict(self, now: float) -> None:
+        if self.idle_ttl_seconds > 0:
+            cursor = self._db.execute(
+                "DELETE FROM search_sessions WHERE last_used < ?", (now - self.idle_ttl_seconds,)
+            )
+            self.evictions["idle"] += max(0, cursor.rowcount)
+
+        rows = self._db.execute("SELECT key, size FROM search_sessions ORDER BY last_used DESC").fetchall()
+        total_bytes = 0
+        for index, (key, size) in enumerate(rows):
+            total_bytes += size
+            if index == 0:
+                continue
+            if index >= self.max_sessions:
+                self.evictions["lru"] += 1
+            elif total_bytes > self.max_bytes:
+                self.evictions["bytes"] += 1
+            else:
+                continue
+            self._db.execute("DELETE FROM search_sessions WHERE key = ?", (key,))
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            now = time.time()
+            row = self._db.execute(
+                "SELECT body, last_used FROM search_sessions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.idle_ttl_seconds > 0 and now - row[1] > self.idle_ttl_seconds):
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE search_sessions SET last_used = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            self.hits += 1
+            return deserialize_session(row[0])
+
+    def put(self, key: str, session: Dict) -> None:
+        body = serialize_session(session)
+        with self._lock:
+            now = time.time()
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO search_sessions (key, last_used, size, body) VALUES (?, ?, ?, ?)",
+                    (key, now, len(body), body),
+                )
+                self._evict(now)
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"[search] Failed to persist search session: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM search_sessions")
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM search_sessions").fetchone()[0]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            count, total_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_sessions"
+            ).fetchone()
+            return {
+                "backend": "sqlite",
+                "sessions": count,
+                "max_sessions": self.max_sessions,
+                "bytes": total_bytes,
+                "max_bytes": self.max_bytes,
+                "idle_ttl_seconds": self.idle_ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": dict(self.evictions),
+            }
+
+
+class RedisSearchSessionStore:
+    """
+    Search sessions in a Redis-protocol key-value server.
+
+    ``client`` needs ``get``, ``set(name, value, ex=...)``, ``expire``,
+    ``delete`` and ``scan_iter``, as provided by ``redis.Redis``. The idle
+    TTL is the key expiry, refreshed on every read. Count and byte limits
+    are left to the server's ``maxmemory`` policy.
+    """
+
+    def __init__(self, client: Any, idle_ttl_seconds: float = 900.0, prefix: str = "newsrec:search_session:"):
+        self.client = client
+        self.idle_ttl_seconds = max(0.0, float(idle_ttl_seconds))
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def _ttl(self) -> Optional[int]:
+        return max(1, int(self.idle_ttl_seconds)) if self.idle_ttl_seconds > 0 else None
+
+    def get(self, key: str) -> Optional[Dict]:
+        name = self.prefix + key
+        body = self.client.get(name)
+        if body is None:
+            self.misses += 1
+            return None
+
+        if self._ttl():
+            self.client.expire(name, self._ttl())
+        self.hits += 1
+        return deserialize_session(body.decode("utf-8") if isinstance(body, bytes) else body)
+
+    def put(self, key: str, session: Dict) -> None:
+        self.client.set(self.prefix + key, serialize_session(session), ex=self._ttl())
+
+    def clear(self) -> None:
+        for name in list(self.client.scan_iter(match=self.prefix + "*")):
+            self.client.delete(name)
+
+    def stats(self) -> Dict:
+        return {
+            "backend": "redis",
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def open_search_session_store(backend: str = "", redis_client: Any = None):
+    """Open the store configured by SEARCH_SESSION_BACKEND, falling back to worker-local memory"""
+    backend = (backend or os.getenv("SEARCH_SESSION_BACKEND", "local")).strip().lower()
+    max_sessions = int(os.getenv("SEARCH_SESSION_MAX_COUNT", "1000"))
+    max_bytes = int(os.getenv("SEARCH_SESSION_MAX_BYTES", str(64 * 1024 * 1024)))
+    idle_ttl_seconds = float(os.getenv("SEARCH_SESSION_IDLE_TTL_SECONDS", "900"))
+
+    try:
+        if backend == "sqlite":
+            db_path = os.getenv("SEARCH_SESSION_DB", os.path.join(".cache", "search_sessions.sqlite3"))
+            return SqliteSearchSessionStore(db_path, max_sessions, max_bytes, idle_ttl_seconds)
+
+        if backend == "redis":
+            if redis_client is None:
+                import redis  # pyright: ignore[reportMissingImports]
+                redis_client = redis.Redis.from_url(os.getenv("SEARCH_SESSION_REDIS_URL", "redis://localhost:6379/0"))
+            return RedisSearchSessionStore(redis_client, idle_ttl_seconds)
+    except Exception as e:
+        print(f"[search] {backend} search session store unavailable ({e}), using worker-local sessions")
+
+    return SearchSessionStore(max_sessions, max_bytes, idle_ttl_seconds)
@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class UpstreamResponseCache:
+    """
+    Cache of raw NewsData.io responses keyed by normalized request params.
+
+    A bounded in-memory LRU tier sits in front of an optional SQLite file so
+    warm responses survive restarts and are shared by workers on the box.
+    Entries expire per request kind: keyword searches and latest-news
+    (headline) requests have separate TTLs. Expired entries stay readable
+    through ``get_stale`` for ``stale_seconds`` more, as a fallback while
+    upstream is unavailable.
+    """
+
+    def __init__(self, ttls: Dict[str, float], max_items: int = 2000, db_path: str = "",
+                 stale_seconds: float = 0.0):
+        self.ttls = dict(ttls)
+        self.max_items = max(1, int(max_items))
+        self.stale_seconds = max(0.0, float(stale_seconds))
+        self.db_path = db_path
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+        if db_path:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS upstream_cache ("
+                "key TEXT PRIMARY KEY, kind TEXT NOT NULL, stored_at REAL NOT NULL, body TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def request_kind(params: Dict) -> str:
+        return "search" if params.get("q") else "headlines"
+
+    @staticmethod
+    def build_key(params: Dict) -> str:
+        normalized = {}
+        for name, value in params.items():
+            if name == "apikey" or value in (None, ""):
+                continue
+            if name in {"q", "language", "country", "category"}:
+                value = " ".join(str(value).lower().split())
+            normalized[name] = value
+        return json.dumps(normalized, sort_keys=True)
+
+    def _ttl(self, kind: str) -> float:
+        return float(self.ttls.get(kind, 0))
+
+    def _is_fresh(self, kind: str, stored_at: float, grace: float = 0.0) -> bool:
+        return time.time() - stored_at <= self._ttl(kind) + grace
+
+    def _remember(self, key: str, kind: str, stored_at: float, data: Dict) -> None:
+        self._entries[key] = (kind, stored_at, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+
+    def get(self, params: Dict) -> Optional[Dict]:
+        kind = self.request_kind(params)
+        if self._ttl(kind) <= 0:
+            return None
+
+        key = self.build_key(params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                _, stored_at, data = entry
+                if self._is_fresh(kind, stored_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return data
+                if not self._is_fresh(kind, stored_at, self.stale_seconds):
+                    self._entries.pop(key, None)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, body FROM upstream_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and self._is_fresh(kind, row[0]):
+                    data = json.loads(row[1])
+                    self._remember(key, kind, row[0], data)
+                    self.disk_hits += 1
+                    return data
+
+            self.misses += 1
+            return None
+
+    def get_stale(self, params: Dict) -> Optional[Dict]:
+        """Return a response up to ``stale_seconds`` past its TTL, for use while upstream is down"""
+        kind = self.request_kind(params)
+        if self._ttl(kind) <= 0 or self.stale_seconds <= 0:
+            return None
+
+        key = self.build_key(params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(kind, entry[1], self.stale_seconds):
+                self.stale_hits += 1
+                return entry[2]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, body FROM upstream_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and self._is_fresh(kind, row[0], self.stale_seconds):
+                    self.stale_hits += 1
+                    return json.loads(row[1])
+
+            return None
+
+    def put(self, params: Dict, data: Dict) -> None:
+        kind = self.request_kind(params)
+        if self._ttl(kind) <= 0:
+            return
+
+        key = self.build_key(params)
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, kind, stored_at, data)
+
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO upstream_cache (key, kind, stored_at, body) VALUES (?, ?, ?, ?)",
+                        (key, kind, stored_at, json.dumps(data)),
+                    )
+                    self._writes += 1
+                    if self._writes % 200 == 0:
+                        self._prune()
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"[cache] Failed to persist upstream response: {e}")
+
+    def _prune(self) -> None:
+        oldest_usable = time.time() - max(self.ttls.values() or [0]) - self.stale_seconds
+        self._db.execute("DELETE FROM upstream_cache WHERE stored_at < ?", (oldest_usable,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM upstream_cache")
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_items": self.max_items,
+                "ttl_seconds": dict(self.ttls),
+                "disk_tier": bool(self._db),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "stale_hits": self.stale_hits,
+                "stale_seconds": self.stale_seconds,
+                "misses": self.misses,
+                "hit_rate": ((self.hits + self.disk_hits) / lookups) if lookups else 0.0,
+            }
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+# Fraction of the bucket a class must leave untouched for higher priorities,
+# and how long a call of that class may wait for a token before failing fast.
+PRIORITY_RESERVES = {
+    "interactive": 0.0,
+    "feed": 0.1,
+    "headlines": 0.25,
+    "background": 0.5,
+}
+PRIORITY_MAX_WAIT_SECONDS = {
+    "interactive": 2.0,
+    "feed": 1.0,
+    "headlines": 0.5,
+    # Background work runs off the request path, so it can wait out a short dip below its reserve
+    "background": 5.0,
+}
+
+
+class UpstreamBudgetExhausted(Exception):
+    """No upstream budget for this priority class within its wait limit"""
+
+    def __init__(self, priority: str, retry_after: float):
+        super().__init__(f"429 NewsData budget exhausted for {priority} requests, retry after {retry_after:.1f}s")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class UpstreamScheduler:
+    """
+    Token bucket for NewsData.io calls with priority classes.
+
+    Tokens refill at the plan's rate up to ``burst``. Lower priority classes
+    may only spend tokens above their reserve, so interactive searches keep
+    working when background work has drained the bucket. A 429 from
+    upstream blocks the bucket until its Retry-After has passed.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: float):
+        self.rate = max(0.001, float(rate_per_minute)) / 60
+        self.burst = max(1.0, float(burst))
+        self.tokens = self.burst
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.granted: Dict[str, int] = {priority: 0 for priority in PRIORITY_RESERVES}
+        self.rejected: Dict[str, int] = {priority: 0 for priority in PRIORITY_RESERVES}
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, priority: str) -> float:
+        """Take a token for ``priority`` and return how long to wait before calling upstream"""
+        priority = priority if priority in PRIORITY_RESERVES else "interactive"
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            floor = self.burst * PRIORITY_RESERVES[priority]
+            wait = max(0.0, (floor + 1 - self.tokens) / self.rate, self.blocked_until - now)
+            if wait > PRIORITY_MAX_WAIT_SECONDS[priority]:
+                self.rejected[priority] += 1
+                raise UpstreamBudgetExhausted(priority, wait)
+
+            self.tokens -= 1
+            self.granted[priority] += 1
+            return wait
+
+    def has_spare(self, priority: str, calls: float = 1.0) -> bool:
+        """Whether ``calls`` tokens above ``priority``'s reserve are available right now"""
+        priority = priority if priority in PRIORITY_RESERVES else "interactive"
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return now >= self.blocked_until and self.tokens - self.burst * PRIORITY_RESERVES[priority] >= calls
+
+    def acquire(self, priority: str) -> None:
+        wait = self.reserve(priority)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, priority: str) -> None:
+        wait = self.reserve(priority)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: Optional[float]) -> None:
+        """Upstream answered 429: stop spending until Retry-After has elapsed"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, now + max(1.0, retry_after or 60.0))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "tokens": round(self.tokens, 2),
+                "burst": self.burst,
+                "rate_per_minute": self.rate * 60,
+                "blocked_for_seconds": max(0.0, self.blocked_until - now),
+                "granted": dict(self.granted),
+                "rejected": dict(self.rejected),
+            }
@@ -0,0 +1,123 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .models import SearchHistory, User, UserInterest, UserLocation
+
+
+def load_user_context(db: Session, email: str, history_limit: int = 8) -> Optional[Dict]:
+    """
+    User id, interests, country and most recent search queries in one round-trip.
+
+    The recent history is a derived table limited to ``history_limit`` rows,
+    outer-joined with interests and location, so the result has at most
+    interests x history rows, folded back into one dict here.
+    """
+    recent = (
+        select(SearchHistory.id, SearchHistory.user_id, SearchHistory.query, SearchHistory.searched_at)
+        .join(User, User.id == SearchHistory.user_id)
+        .where(User.email == email)
+        .order_by(SearchHistory.searched_at.desc(), SearchHistory.id.desc())
+        .limit(max(1, int(history_limit)))
+        .subquery()
+    )
+    statement = (
+        select(
+            User.id,
+            User.email,
+            UserLocation.country_code,
+            UserInterest.id,
+            UserInterest.interest,
+            recent.c.id,
+            recent.c.query,
+            recent.c.searched_at,
+        )
+        .outerjoin(UserLocation, UserLocation.user_id == User.id)
+        .outerjoin(UserInterest, UserInterest.user_id == User.id)
+        .outerjoin(recent, recent.c.user_id == User.id)
+        .where(User.email == email)
+    )
+    rows = db.execute(statement).all()
+    if not rows:
+        return None
+
+    interests: Dict[int, str] = {}
+    history: Dict[int, tuple] = {}
+    for _, _, _, interest_id, interest, history_id, query, searched_at in rows:
+        if interest_id is not None:
+            interests[interest_id] = interest
+        if history_id is not None:
+            history[history_id] = (searched_at, history_id, query)
+
+    return {
+        "user_id": rows[0][0],
+        "email": rows[0][1],
+        "country_code": rows[0][2] or "",
+        "interests": [interests[key] for key in sorted(interests)],
+        "history": [query for _, _, query in sorted(history.values(), reverse=True)],
+    }
+
+
+class UserContextCache:
+    """
+    Per-worker LRU of loaded user contexts, keyed by normalized email.
+
+    Entries expire after ``ttl_seconds``, which bounds how long a write
+    handled by another worker can go unseen; writes in this worker call
+    ``invalidate`` directly. A context loaded while an invalidation ran is
+    not stored, since it may predate the write.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_users: int = 10000):
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_users = max(1, int(max_users))
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.epoch = 0
+
+    def get(self, email: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or time.monotonic() - entry[1] > self.ttl_seconds:
+                self._entries.pop(email, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, email: str, context: Dict, epoch: int) -> None:
+        """Store ``context`` unless something was invalidated since ``epoch`` was read"""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            self._entries[email] = (context, time.monotonic())
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            self.epoch += 1
+            if self._entries.pop(email, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "users": len(self._entries),
+                "max_users": self.max_users,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
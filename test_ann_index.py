@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+IVF index search, bounds and the snapshot shared by workers
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.ann_index import IVFIndex
+
+
+def _clustered(count: int, dimension: int = 16, clusters: int = 4, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension))
+    labels = np.arange(count) % clusters
+    return centers[labels] + 0.05 * rng.standard_normal((count, dimension)), labels
+
+
+def _add(index: IVFIndex, prefix: str, vectors: np.ndarray, timestamp=None) -> None:
+    ids = [f"{prefix}{row}" for row in range(len(vectors))]
+    index.add(ids, vectors, [{"url": item_id} for item_id in ids], timestamp=timestamp)
+
+
+def test_trained_index_finds_nearest_neighbours():
+    vectors, labels = _clustered(200)
+    index = IVFIndex(16, nlist=4, nprobe=2)
+    _add(index, "a", vectors)
+
+    assert index.stats()["trained"]
+    hits = index.search(vectors[7], k=5)
+    assert hits[0][1]["url"] == "a7"
+    assert all(labels[int(meta["url"][1:])] == labels[7] for _, meta in hits)
+
+
+def test_upsert_replaces_and_max_items_drops_oldest():
+    vectors, _ = _clustered(6)
+    index = IVFIndex(16, nlist=4, max_items=4)
+    now = time.time()
+    for row in range(6):
+        index.add([f"a{row}"], vectors[row:row + 1], [{"url": f"a{row}"}], timestamp=now + row)
+    index.add(["a5"], vectors[0:1], [{"url": "a5", "version": 2}], timestamp=now + 10)
+
+    assert len(index) == 4
+    assert {meta["url"] for _, meta in index.search(vectors[0], k=10)} == {"a2", "a3", "a4", "a5"}
+    assert index.search(vectors[0], k=1)[0][1] == {"url": "a5", "version": 2}
+
+
+def test_saves_from_several_workers_keep_each_others_rows(tmp_path):
+    path = str(tmp_path / "articles.npz")
+    vectors, _ = _clustered(20)
+    first, second = IVFIndex(16, nlist=4), IVFIndex(16, nlist=4)
+    _add(first, "a", vectors[:10])
+    _add(second, "b", vectors[10:])
+
+    first.save(path)
+    second.save(path)
+    first.save(path)
+
+    restored = IVFIndex(16, nlist=4)
+    assert restored.load(path)
+    assert len(restored) == 20
+
+
+def test_merged_snapshot_keeps_the_newest_rows_within_max_items(tmp_path):
+    path = str(tmp_path / "articles.npz")
+    vectors, _ = _clustered(12)
+    old, new = IVFIndex(16, nlist=4), IVFIndex(16, nlist=4, max_items=8)
+    _add(old, "old", vectors[:8], timestamp=time.time() - 60)
+    _add(new, "new", vectors[8:])
+
+    old.save(path)
+    new.save(path)
+
+    restored = IVFIndex(16, nlist=4)
+    restored.load(path)
+    urls = {meta["url"] for _, meta in restored.search(vectors[0], k=20)}
+    assert len(urls) == 8
+    assert {f"new{row}" for row in range(4)} <= urls
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Rotating Bloom filter and per-request dedupe views
+"""
+
+import pytest
+
+from src import article_dedupe
+from src.article_dedupe import BloomFilter, DedupeView, RotatingBloomFilter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(article_dedupe, "time", fake)
+    return fake
+
+
+def test_false_positive_rate_stays_near_target():
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for index in range(2000):
+        bloom.add(f"url:http://x/{index}")
+
+    assert all(f"url:http://x/{index}" in bloom for index in range(2000))
+    false_positives = sum(f"url:http://y/{index}" in bloom for index in range(10000))
+    assert false_positives < 10000 * 0.02
+
+
+def test_keys_survive_one_rotation_and_expire_after_two(clock):
+    shared = RotatingBloomFilter(capacity=100, rotation_seconds=60)
+    shared.add_all(["url:a"])
+
+    clock.now += 60
+    assert shared.contains_any(["url:a"])
+    clock.now += 60
+    assert not shared.contains_any(["url:a"])
+    assert shared.stats()["rotations"] == 2
+
+
+def test_full_generation_rotates_early(clock):
+    shared = RotatingBloomFilter(capacity=10, rotation_seconds=3600)
+    shared.add_all([f"url:{index}" for index in range(10)])
+    shared.add_all(["url:next"])
+
+    stats = shared.stats()
+    assert stats["rotations"] == 1
+    assert (stats["previous_keys"], stats["current_keys"]) == (10, 1)
+
+
+def test_views_only_share_keys_within_a_namespace():
+    shared = RotatingBloomFilter(capacity=100)
+    DedupeView(shared, namespace="session-a").add(["url:a", ""])
+
+    assert DedupeView(shared, namespace="session-a").is_duplicate(["url:a"])
+    assert not DedupeView(shared, namespace="session-b").is_duplicate(["url:a"])
+
+    request = DedupeView(shared)
+    assert not request.is_duplicate(["url:a"])
+    request.add(["url:b"])
+    assert request.is_duplicate(["url:b"])
+    assert not DedupeView(shared).is_duplicate(["url:b"])
+    assert shared.stats()["current_keys"] == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker state machine, and probe accounting in the NewsData client
+"""
+
+import asyncio
+
+import pytest
+
+from src import circuit_breaker
+from src.circuit_breaker import CircuitBreaker
+from src.newsdata_client import NewsDataClient, NewsDataRequestError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, recovery_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_half_open_hands_out_one_probe_and_closes_on_success(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_for_a_full_recovery_period(clock):
+    breaker = CircuitBreaker("test", failure_threshold=5, recovery_seconds=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["times_opened"] == 2
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+def test_released_probe_can_be_taken_again(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_seconds=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    for name in ("NEWSDATA_CACHE_DB", "ARTICLE_INDEX_DB", "ANN_INDEX_DIR", "OPENAI_API_KEY"):
+        monkeypatch.setenv(name, "")
+    monkeypatch.setenv("NEWSDATA_BREAKER_FAILURES", "1")
+    monkeypatch.setenv("NEWSDATA_BREAKER_RECOVERY_SECONDS", "0")
+    client = NewsDataClient(api_key="test")
+    client.newsdata_breaker.record_failure()
+    return client
+
+
+def test_cancelled_probe_is_handed_back(client, monkeypatch):
+    async def hang(params, timeout):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(client, "_asend_request", hang)
+
+    async def cancel_probe():
+        task = asyncio.create_task(client._arequest_page({"q": "probe"}))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_probe())
+    assert client.newsdata_breaker.allow()
+
+
+def test_unparseable_body_counts_as_a_failed_probe(client, monkeypatch):
+    class HtmlResponse:
+        def json(self):
+            raise ValueError("Expecting value")
+
+    monkeypatch.setattr(client, "_send_request", lambda params, timeout: client._decode_response(HtmlResponse()))
+
+    with pytest.raises(NewsDataRequestError):
+        client._request_page({"q": "probe"})
+    assert client.newsdata_breaker.stats()["times_opened"] == 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
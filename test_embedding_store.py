@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Ring buffer reuse in the shared embedding store
+"""
+
+import numpy as np
+import pytest
+
+from src.embedding_store import EmbeddingStore
+
+
+def _vector(value: float) -> np.ndarray:
+    return np.full((1, 4), value, dtype=np.float32)
+
+
+@pytest.fixture
+def workers(tmp_path):
+    # Two stores on one directory behave like two API workers on a box
+    return EmbeddingStore(str(tmp_path), dimension=4, capacity=3), EmbeddingStore(str(tmp_path), dimension=4, capacity=3)
+
+
+def test_recycled_row_is_a_miss_for_its_old_key(workers):
+    writer, _ = workers
+    for index in range(4):
+        writer.put_many([f"k{index}"], _vector(index))
+
+    found = writer.get_many(["k0", "k1", "k3"])
+    assert sorted(found) == ["k1", "k3"]
+    assert np.all(found["k3"] == 3)
+    assert len(writer) == 3
+
+
+def test_row_recycled_by_another_worker_is_a_miss(workers):
+    writer, reader = workers
+    writer.put_many(["k0", "k1", "k2"], np.concatenate([_vector(0), _vector(1), _vector(2)]))
+    assert sorted(reader.get_many(["k0", "k1", "k2"])) == ["k0", "k1", "k2"]
+
+    writer.put_many(["k3"], _vector(3))
+    found = reader.get_many(["k0", "k3"])
+    assert list(found) == ["k3"]
+    assert np.all(found["k3"] == 3)
+
+
+def test_row_recycled_while_being_copied_is_a_miss(workers):
+    writer, reader = workers
+    writer.put_many(["k0", "k1", "k2"], np.concatenate([_vector(0), _vector(1), _vector(2)]))
+    reader.get_many(["k0"])
+
+    class RecycleOnRead:
+        """Lets the other worker overwrite the row between the reader's key check and its copy"""
+
+        def __init__(self, vectors):
+            self.vectors = vectors
+
+        def __getitem__(self, slot):
+            writer.put_many(["k3"], _vector(3))
+            return self.vectors[slot]
+
+    reader._vectors = RecycleOnRead(reader._vectors)
+    assert reader.get_many(["k0"]) == {}
+
+
+def test_existing_keys_are_not_written_twice(workers):
+    writer, _ = workers
+    writer.put_many(["k0"], _vector(0))
+    writer.put_many(["k0", "k1"], np.concatenate([_vector(9), _vector(1)]))
+
+    found = writer.get_many(["k0", "k1"])
+    assert np.all(found["k0"] == 0)
+    assert len(writer) == 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
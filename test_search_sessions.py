@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Search pagination sessions continued across workers
+"""
+
+import numpy as np
+import pytest
+
+from src import search_sessions
+from src.newsdata_client import NewsDataClient
+from src.search_sessions import SearchSessionStore, SqliteSearchSessionStore
+
+
+def _overlapping_pages(params, timeout):
+    # Each upstream page repeats the last two articles of the previous one
+    number = int((params.get("page") or "p0")[1:])
+    ids = range(number * 3, number * 3 + 5)
+    return {
+        "status": "success",
+        "results": [
+            {"title": f"Story {i}", "description": f"About story {i}", "link": f"http://x/{i}",
+             "pubDate": "2024-01-01 00:00:00", "source_id": "s"}
+            for i in ids
+        ],
+        "nextPage": f"p{number + 1}" if number < 8 else None,
+    }
+
+
+def _worker(monkeypatch):
+    client = NewsDataClient(api_key="test")
+    monkeypatch.setattr(client, "_send_request", _overlapping_pages)
+    monkeypatch.setattr(client, "_calculate_similarity_scores", lambda query, articles: [0.5] * len(articles))
+    return client
+
+
+@pytest.fixture
+def workers(monkeypatch, tmp_path):
+    for name in ("NEWSDATA_CACHE_DB", "ARTICLE_INDEX_DB", "ANN_INDEX_DIR", "OPENAI_API_KEY"):
+        monkeypatch.setenv(name, "")
+    monkeypatch.setenv("SEARCH_SESSION_BACKEND", "sqlite")
+    monkeypatch.setenv("SEARCH_SESSION_DB", str(tmp_path / "search_sessions.sqlite3"))
+    return _worker(monkeypatch), _worker(monkeypatch)
+
+
+def _search(client, page):
+    return client.search_news("story", category="technology", page_size=5, page=page, per_page=5)
+
+
+def test_session_continued_on_another_worker_skips_served_articles(workers):
+    first, second = workers
+    served = []
+    for client, page in ((first, 1), (first, 2), (second, 3), (first, 4), (second, 5)):
+        result = _search(client, page)
+        assert result["status"] == "success"
+        assert len(result["articles"]) == 5
+        served += [article["url"] for article in result["articles"]]
+
+    assert served == [f"http://x/{i}" for i in range(25)]
+
+
+def test_new_search_is_not_suppressed_by_an_earlier_session(workers):
+    first, _ = workers
+    _search(first, 1)
+    _search(first, 2)
+
+    urls = [article["url"] for article in _search(first, 1)["articles"]]
+    assert urls == [f"http://x/{i}" for i in range(5)]
+
+
+def test_local_store_hands_each_search_its_own_copy():
+    store = SearchSessionStore()
+    store.put("key", {"articles": [{"url": "http://x/0"}], "pending_pages": [[{"link": "http://x/1"}]]})
+
+    first, second = store.get("key"), store.get("key")
+    first["articles"].append({"url": "http://x/1"})
+    first["pending_pages"].pop(0)
+
+    assert second["articles"] == [{"url": "http://x/0"}]
+    assert len(second["pending_pages"]) == 1
+    assert len(store.get("key")["articles"]) == 1
+
+    store.put("key", first)
+    assert len(store.get("key")["articles"]) == 2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(search_sessions, "time", fake)
+    return fake
+
+
+def test_local_store_evicts_least_recently_used_and_idle_sessions(clock):
+    store = SearchSessionStore(max_sessions=2, idle_ttl_seconds=60)
+    store.put("a", {"articles": []})
+    store.put("b", {"articles": []})
+    store.get("a")
+    store.put("c", {"articles": []})
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+
+    clock.now += 61
+    assert store.get("c") is None
+    assert store.stats()["evictions"] == {"lru": 1, "idle": 2, "bytes": 0}
+
+
+def test_sqlite_store_round_trips_scored_sessions(tmp_path):
+    path = str(tmp_path / "search_sessions.sqlite3")
+    session = {
+        "articles": [{"url": "http://x/0", "similarity_score": np.float32(0.5), "final_score": 0.75}],
+        "dedupe_id": "abc",
+        "pending_pages": [[{"link": "http://x/1"}]],
+        "next_page": "p1",
+        "fetch_done": False,
+    }
+    SqliteSearchSessionStore(path).put("key", session)
+
+    restored = SqliteSearchSessionStore(path).get("key")
+    assert restored["articles"] == [{"url": "http://x/0", "similarity_score": 0.5, "final_score": 0.75}]
+    assert restored["pending_pages"] == session["pending_pages"]
+    assert (restored["dedupe_id"], restored["next_page"], restored["fetch_done"]) == ("abc", "p1", False)
+
+
+def test_sqlite_store_keeps_the_most_recent_sessions(tmp_path, clock):
+    store = SqliteSearchSessionStore(str(tmp_path / "search_sessions.sqlite3"), max_sessions=2)
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        store.put(key, {"articles": []})
+
+    assert len(store) == 2
+    assert store.get("a") is None
+    assert store.stats()["evictions"]["lru"] == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Coalescing of concurrent identical upstream calls
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.singleflight import SingleFlight
+
+
+def test_concurrent_threads_share_one_execution():
+    flights = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"results": []}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", fetch)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flights.do("key", fetch))) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    deadline = time.monotonic() + 5
+    while flights.stats()["coalesced"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"results": []}] * 4
+    assert flights.stats() == {"executed": 1, "coalesced": 3, "in_flight": 0}
+
+
+def test_waiters_get_the_leader_exception_and_the_next_call_runs_again():
+    flights = SingleFlight()
+
+    async def main():
+        attempts = []
+
+        async def failing():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*(flights.ado("key", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(attempts) == 1
+
+        async def succeeding():
+            return "ok"
+
+        assert await flights.ado("key", succeeding) == "ok"
+
+    asyncio.run(main())
+    assert flights.stats() == {"executed": 2, "coalesced": 2, "in_flight": 0}
+
+
+def test_one_cancelled_waiter_does_not_cancel_the_shared_call():
+    flights = SingleFlight()
+
+    async def main():
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "page"
+
+        first = asyncio.create_task(flights.ado("key", fetch))
+        second = asyncio.create_task(flights.ado("key", fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "page"
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
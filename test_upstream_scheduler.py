@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Priority reserves and waits of the upstream token bucket
+"""
+
+import pytest
+
+from src import upstream_scheduler
+from src.upstream_scheduler import UpstreamBudgetExhausted, UpstreamScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(upstream_scheduler, "time", fake)
+    return fake
+
+
+def _drain(scheduler: UpstreamScheduler, calls: int) -> None:
+    for _ in range(calls):
+        assert scheduler.reserve("interactive") == 0.0
+
+
+def test_lower_priorities_leave_their_reserve_for_interactive(clock):
+    # 30/min refills one token every 2 s
+    scheduler = UpstreamScheduler(rate_per_minute=30, burst=10)
+    _drain(scheduler, 4)
+
+    # 6 tokens: background may spend down to its 5-token reserve
+    assert scheduler.has_spare("background")
+    assert scheduler.reserve("background") == 0.0
+    assert not scheduler.has_spare("background")
+    assert scheduler.has_spare("headlines")
+    assert scheduler.reserve("headlines") == 0.0
+    assert scheduler.reserve("feed") == 0.0
+
+    # 3 tokens left: interactive still goes straight through
+    _drain(scheduler, 3)
+    assert scheduler.stats()["granted"] == {"interactive": 7, "feed": 1, "headlines": 1, "background": 1}
+
+
+def test_waits_within_the_class_limit_and_rejects_beyond_it(clock):
+    scheduler = UpstreamScheduler(rate_per_minute=30, burst=10)
+    _drain(scheduler, 5)
+
+    # 5 tokens, background needs 6: one refill (2 s) is within its wait
+    assert scheduler.reserve("background") == pytest.approx(2.0)
+
+    # 4 tokens, headlines needs 3.5: no wait
+    assert scheduler.reserve("headlines") == 0.0
+
+    # 3 tokens, background needs 6: 6 s is past its limit
+    with pytest.raises(UpstreamBudgetExhausted) as rejected:
+        scheduler.reserve("background")
+    assert rejected.value.retry_after == pytest.approx(6.0)
+    assert scheduler.stats()["rejected"]["background"] == 1
+
+
+def test_interactive_waits_for_a_refill_when_the_bucket_is_empty(clock):
+    scheduler = UpstreamScheduler(rate_per_minute=30, burst=2)
+    _drain(scheduler, 2)
+    assert scheduler.reserve("interactive") == pytest.approx(2.0)
+    with pytest.raises(UpstreamBudgetExhausted):
+        scheduler.reserve("interactive")
+
+    clock.now += 10
+    assert scheduler.stats()["tokens"] == pytest.approx(2.0)
+
+
+def test_upstream_429_blocks_every_priority_until_retry_after(clock):
+    scheduler = UpstreamScheduler(rate_per_minute=30, burst=10)
+    scheduler.penalize(retry_after=30)
+
+    assert not scheduler.has_spare("interactive")
+    with pytest.raises(UpstreamBudgetExhausted):
+        scheduler.reserve("interactive")
+
+    clock.now += 30
+    assert scheduler.reserve("interactive") == 0.0
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))